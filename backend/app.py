@@ -1,17 +1,27 @@
+from dotenv import load_dotenv
+
+# Load .env file before importing modules that read their settings from it
+load_dotenv()
+
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from dotenv import load_dotenv
-from course_scraper import get_course_info
-from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
-from models import db, User, Course, UserCompletedCourse, UserSchedule, ScheduleCourse
+from course_scraper import get_course_info, get_course_infos, normalize_course_code
+from db_migrations import upgrade_database
+from models import db, User, UserSchedule, ScheduleCourse
 import os
+import tempfile
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
-import re
-from recommendation_services import recommend_courses
-
-# Load .env file
-load_dotenv()
+from sqlalchemy.orm import selectinload
+from recommendation_services import recommend_courses, recommendation_etag
+from degree_planner import DEFAULT_MAX_CREDITS, plan_degree
+from schedule_builder import build_schedules
+from schedule_validation import validate_schedule
+from time_model import DAY_INDEX, format_clock, minute_of_week
+from password_hasher import PasswordHasherBusy, check_password, hash_password, needs_rehash
+from transcript_parser import TRANSCRIPT_MAX_BYTES, TranscriptParseError, TranscriptParserBusy, parse_transcript_in_pool
+from course_repository import completed_codes, ingest_transcript, invalidate_completed, resolve_courses
 
 app = Flask(__name__)
 CORS(app)  # allows frontend (React) to talk to backend 
@@ -19,16 +29,22 @@ CORS(app)  # allows frontend (React) to talk to backend
 # Database configuration (PostgreSQL)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Werkzeug stops reading any request body past this, including chunked uploads
+app.config['MAX_CONTENT_LENGTH'] = TRANSCRIPT_MAX_BYTES
 
 db.init_app(app)   # this initializes SQLAlchemy after app is created
-bcrypt = Bcrypt(app)
-#
 
+# Create or upgrade the schema through Alembic migrations
 with app.app_context():
-    db.create_all()
+    upgrade_database(db)
 
 app.secret_key = os.getenv("SECRET_KEY")
 
+# Serve course data from a prebuilt snapshot when one is configured
+if os.getenv('COURSE_SNAPSHOT_PATH'):
+    from course_snapshot import CourseSnapshot, install_snapshot
+    install_snapshot(CourseSnapshot.from_file(os.getenv('COURSE_SNAPSHOT_PATH')))
+
 @app.route("/")
 def index():
     return "Welcome to Plan A Gator Flask backend!"
@@ -39,11 +55,73 @@ def hello():
 
 @app.route("/api/upload", methods=["POST"])
 def upload_transcript():
+    """Parse an uploaded transcript PDF and save its courses if user_id is given"""
+    # Bodies over MAX_CONTENT_LENGTH are rejected while reading (see request_too_large)
     file = request.files.get("file")
     if not file:
         return jsonify(error="No file uploaded"), 400
-    # TODO: parse transcript here
-    return jsonify(message="Transcript received!")
+
+    user_id = request.form.get('user_id', type=int)
+    if user_id is not None and not User.query.get(user_id):
+        return jsonify(error='User not found'), 404
+
+    # Spool to disk in chunks, the worker process reads it page by page
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            file.save(spool)
+        parsed = parse_transcript_in_pool(path)
+    except TranscriptParserBusy as e:
+        return jsonify(error=str(e)), 503, {'Retry-After': '5'}
+    except TranscriptParseError as e:
+        return jsonify(error=str(e)), 400
+    except FutureTimeoutError:
+        return jsonify(error='Transcript took too long to parse'), 504
+    finally:
+        os.remove(path)
+
+    print(f"DEBUG - Parsed transcript: {len(parsed['courses'])} courses on {parsed['pages']} pages")
+    response = {
+        'message': 'Transcript received!',
+        'classes': parsed['courses'],
+        'not_passed': parsed['not_passed'],
+        'grades': parsed['grades'],
+    }
+    if user_id is None:
+        return jsonify(response)
+
+    # Same bulk path as /save-transcript
+    try:
+        result = ingest_transcript(user_id, parsed['courses'])
+        db.session.commit()
+        invalidate_completed(user_id)
+    except Exception as e:
+        db.session.rollback()
+        print(f"ERROR - Saving parsed transcript failed: {str(e)}")
+        return jsonify({'error': 'Failed to save transcript', 'details': str(e)}), 500
+
+    response.update({
+        'saved_count': result['saved_count'],
+        'total_courses': result['total_courses'],
+        'skipped': result['skipped'],
+        'errors': result['errors'] if result['errors'] else None,
+    })
+    return jsonify(response)
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify(error=f"Upload larger than {TRANSCRIPT_MAX_BYTES // (1024 * 1024)} MB"), 413
+
+def _not_modified(etag):
+    """True if the client already has the response for etag"""
+    return etag is not None and request.if_none_match.contains(etag)
+
+def _with_etag(response, etag):
+    # no-cache: the browser keeps the body but revalidates, so a changed transcript is seen at once
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 @app.route('/get-recommended-courses/<int:user_id>', methods=['GET'])
 def get_recommended_courses(user_id):
@@ -52,32 +130,64 @@ def get_recommended_courses(user_id):
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        # Get completed courses from database
-        completed_courses = UserCompletedCourse.query.filter_by(user_id=user_id).all()
-        completed_codes = [cc.course.course_code for cc in completed_courses if cc.course]
+        # Completed courses, cached per user
+        completed = completed_codes(user_id)
         
+        college = user.college or 'Engineering'  # Default if not set
+        seed = request.args.get('seed', type=int)
+        etag = recommendation_etag(college, completed, seed=seed)
+        if _not_modified(etag):
+            return _with_etag(app.response_class(status=304), etag)
+
         # Get recommendations
         recommendations = recommend_courses(
-            college=user.college or 'Engineering',  # Default if not set
-            transcipt_codes=completed_codes
+            college=college,
+            transcipt_codes=completed,
+            seed=seed
         )
         
-        return jsonify({
+        return _with_etag(jsonify({
             'courses': recommendations,
-            'completed_courses': completed_codes
-        })
+            'completed_courses': completed
+        }), etag)
         
     except Exception as e:
         print(f"Error getting recommended courses: {str(e)}")
         return jsonify({'error': 'Failed to get recommended courses'}), 500
     
+@app.route('/get-degree-plan/<int:user_id>', methods=['GET'])
+def get_degree_plan(user_id):
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    max_credits = request.args.get('max_credits', DEFAULT_MAX_CREDITS, type=int)
+    electives = request.args.get('electives', 0, type=int)
+
+    completed = completed_codes(user_id)
+
+    try:
+        plan = plan_degree(user.college or 'ENG', completed, max_credits=max_credits, electives=electives)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    plan['completed_courses'] = completed
+    return jsonify(plan)
+
 #wire course recommendations to backend
 
 # Real database routes
 @app.route('/signup', methods=['POST'])
 def signup():
     data = request.get_json()
-    hashed_pw = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    try:
+        hashed_pw = hash_password(data.get('password'))
+    except PasswordHasherBusy as e:
+        return jsonify(error=str(e)), 503, {'Retry-After': '2'}
+    except FutureTimeoutError:
+        return jsonify(error='Password hashing took too long'), 503, {'Retry-After': '2'}
+    except ValueError as e:
+        return jsonify({'error': f'Invalid password: {str(e)}'}), 400
     new_user = User(
         username=data['username'],
         password_hash=hashed_pw,
@@ -102,9 +212,26 @@ def signup():
 def signin():
     data = request.get_json()
     user = User.query.filter_by(email=data.get('email')).first()
-    if user and bcrypt.check_password_hash(user.password_hash, data.get('password')):
-        return jsonify({'message': 'Login successful', 'user_id': user.user_id})
-    return jsonify({'error': 'Invalid credentials'}), 401
+    try:
+        if not user or not check_password(user.password_hash, data.get('password')):
+            return jsonify({'error': 'Invalid credentials'}), 401
+    except PasswordHasherBusy as e:
+        return jsonify(error=str(e)), 503, {'Retry-After': '2'}
+    except FutureTimeoutError:
+        return jsonify(error='Password check took too long'), 503, {'Retry-After': '2'}
+
+    # Upgrade hashes made with an older BCRYPT_LOG_ROUNDS while the password is at hand
+    if needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hash_password(data['password'])
+            db.session.commit()
+        except (PasswordHasherBusy, FutureTimeoutError):
+            # The sign-in still succeeds, the hash is upgraded next time
+            pass
+        except Exception as e:
+            db.session.rollback()
+            print(f"WARNING: Could not rehash password for user {user.user_id}: {str(e)}")
+    return jsonify({'message': 'Login successful', 'user_id': user.user_id})
 
 @app.route('/update-user-info', methods=['POST'])
 def update_user_info():
@@ -124,8 +251,8 @@ def update_user_info():
 
 @app.route('/get-course-recommendations', methods=['GET'])
 def get_recommendations():
-    user_id = request.args.get('user_id')
-    classes = request.args.get('classes', '')
+    user_id = request.args.get('user_id', type=int)
+    classes = request.args.get('classes')
 
     if not user_id:
         return jsonify({'error': 'Missing user_id'}), 400
@@ -134,17 +261,26 @@ def get_recommendations():
     if not user:
         return jsonify({'error': 'User not found'}), 404
     print("college" + user.college)
-    completed_courses = [c.strip().upper() for c in classes.split(',') if c.strip()]
+    if classes is None:
+        # No transcript passed, use the saved one
+        completed_courses = completed_codes(user_id)
+    else:
+        completed_courses = [c.strip().upper() for c in classes.split(',') if c.strip()]
+    seed = request.args.get('seed', type=int)
+    etag = recommendation_etag(user.college, completed_courses, seed=seed)
+    if _not_modified(etag):
+        return _with_etag(app.response_class(status=304), etag)
 
     # Get recommendations using your service
     recommendations = recommend_courses(
         college=user.college,
-        transcipt_codes=completed_courses
+        transcipt_codes=completed_courses,
+        seed=seed
     )
 
     print("Recommendations:", recommendations)
     
-    return jsonify({'recommendations': recommendations})
+    return _with_etag(jsonify({'recommendations': recommendations}), etag)
 
 @app.route('/save-transcript', methods=['POST'])
 def save_transcript():
@@ -163,95 +299,33 @@ def save_transcript():
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        # Normalize course codes
-        normalized = []
-        seen = set()
-        for raw in classes:
-            if raw is None:
-                continue
-            code = re.sub(r"\s+", "", str(raw)).upper()
-            if not code or code in seen:
-                continue
-            seen.add(code)
-            normalized.append(code)
-        
-        print(f"DEBUG - Normalized courses: {normalized}")
-
-        saved_count = 0
-        skipped = []
-        errors = []
-        
-        for code in normalized:
-            try:
-                print(f"DEBUG - Processing course: {code}")
-                
-                # Step 1: Find or create Course entry
-                print(f"DEBUG - Querying for course: {code}")
-                course = Course.query.filter_by(course_code=code).first()
-                print(f"DEBUG - Query result: {course}")
-                
-                if not course:
-                    print(f"DEBUG - Creating new course: {code}")
-                    course = Course(
-                        course_code=code,
-                        course_name=f"Course {code}",
-                        credits=3
-                    )
-                    db.session.add(course)
-                    db.session.flush()
-                    print(f"DEBUG - Created course: {code} with course_id={course.course_id}")
-                else:
-                    print(f"DEBUG - Found existing course: {code} with course_id={course.course_id}")
-                        
-                # Step 2: Check if user already completed this course
-                existing = UserCompletedCourse.query.filter_by(
-                    user_id=user_id,
-                    course_id=course.course_id
-                ).first()
-                
-                if not existing:
-                    # Step 3: Link user to course
-                    user_course = UserCompletedCourse(
-                        user_id=user_id,
-                        course_id=course.course_id
-                    )
-                    db.session.add(user_course)
-                    saved_count += 1
-                    print(f"DEBUG - Linked user {user_id} to course {code} (id={course.course_id})")
-                else:
-                    skipped.append(code)
-                    print(f"DEBUG - User {user_id} already has course {code}")
-                    
-            except Exception as course_error:
-                error_msg = f"Error processing {code}: {str(course_error)}"
-                print(f"ERROR - {error_msg}")
-                import traceback
-                traceback.print_exc()
-                errors.append(error_msg)
-                # ❌ DON'T rollback here - it will undo all previous additions!
-                # Just continue to next course
-                continue
+        # Resolve courses and link them to the user with a fixed number of statements
+        result = ingest_transcript(user_id, classes)
+        saved_count = result['saved_count']
+        print(f"DEBUG - Ingested transcript for user {user_id}: {result}")
 
         # Commit all successful additions at once
+        try:
+            db.session.commit()
+            invalidate_completed(user_id)
+        except Exception as commit_error:
+            db.session.rollback()
+            print(f"ERROR - Commit failed: {str(commit_error)}")
+            import traceback
+            traceback.print_exc()
+            return jsonify({'error': 'Failed to commit changes', 'details': str(commit_error)}), 500
+
         if saved_count > 0:
-            try:
-                db.session.commit()
-                print(f"SUCCESS - Saved {saved_count} courses for user {user_id}")
-            except Exception as commit_error:
-                db.session.rollback()
-                print(f"ERROR - Commit failed: {str(commit_error)}")
-                import traceback
-                traceback.print_exc()
-                return jsonify({'error': 'Failed to commit changes', 'details': str(commit_error)}), 500
+            print(f"SUCCESS - Saved {saved_count} courses for user {user_id}")
         else:
             print(f"WARNING - No new courses to save for user {user_id}")
         
         return jsonify({
             'message': f'{saved_count} courses saved',
             'saved_count': saved_count,
-            'total_courses': len(normalized),
-            'skipped': skipped,
-            'errors': errors if errors else None
+            'total_courses': result['total_courses'],
+            'skipped': result['skipped'],
+            'errors': result['errors'] if result['errors'] else None
         }), 200
         
     except Exception as e:
@@ -278,6 +352,14 @@ def save_schedule():
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
+        # Check the slots against real meeting times before storing anything,
+        # from cached sections only so a slow UF API can't hold up the save
+        validation = validate_schedule(schedule_data, term=str(data.get('term', '2251')))
+        if not validation['valid']:
+            return jsonify({'error': 'Schedule has overlapping classes', 'validation': validation}), 409
+        for slot in validation['skipped']:
+            print(f"WARNING: Skipping slot with unreadable day/time: {slot}")
+        
         # Create new schedule
         new_schedule = UserSchedule(
             user_id=user_id,
@@ -286,80 +368,142 @@ def save_schedule():
         db.session.add(new_schedule)
         db.session.flush()  # Get the schedule_id
         
-        # Save each course in the schedule
-        for time_slot, course_data in schedule_data.items():
-            if course_data:  # If there's a course in this time slot
-                try:
-                    day, time = time_slot.split('-')
-                except ValueError:
-                    continue
-                
-                # Find or create the course
-                course = Course.query.filter_by(course_code=course_data['code']).first()
-                if not course:
-                    course = Course(
-                        course_code=course_data['code'],
-                        course_name=course_data.get('name', f"Course {course_data['code']}"),
-                        credits=course_data.get('credits', 3),
-                        professor=course_data.get('instructor', 'TBD')
-                    )
-                    db.session.add(course)
-                    db.session.flush()
-                
-                # Create schedule course entry
-                schedule_course = ScheduleCourse(
-                    schedule_id=new_schedule.schedule_id,
-                    course_id=course.course_id,
-                    day_of_week=day,
-                    start_time=time
-                )
-                db.session.add(schedule_course)
+        # Each course is resolved once, even when it meets on several days
+        slots = []
+        course_rows = {}
+        for meeting in validation['meetings']:
+            course_data = schedule_data[meeting['slot']]
+            code = course_data['code']
+            slots.append((meeting['day'], meeting['start_minute'], meeting['end_minute'], code))
+            course_rows.setdefault(code, {
+                'course_name': course_data.get('name', f"Course {code}"),
+                'credits': validation['credits']['courses'][meeting['code']],
+                'professor': course_data.get('instructor', 'TBD')
+            })
+        
+        # Find or create all courses, then insert every slot in one statement
+        course_ids = resolve_courses(course_rows)
+        if slots:
+            db.session.execute(insert(ScheduleCourse), [
+                {
+                    'schedule_id': new_schedule.schedule_id,
+                    'course_id': course_ids[code],
+                    'day_of_week': day,
+                    'start_time': format_clock(start),
+                    'end_time': format_clock(end),
+                    'start_minute': minute_of_week(DAY_INDEX[day], start),
+                    'end_minute': minute_of_week(DAY_INDEX[day], end)
+                }
+                for day, start, end, code in slots
+            ])
         
         db.session.commit()
         
         return jsonify({
             'message': 'Schedule saved successfully',
-            'schedule_id': new_schedule.schedule_id
+            'schedule_id': new_schedule.schedule_id,
+            # Courses whose sections weren't loaded were saved with the client's times
+            'verified': validation['verified'],
+            'unverified': validation['unverified']
         }), 201
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Failed to save schedule: {str(e)}'}), 500
 
+@app.route('/validate-schedule', methods=['POST'])
+def validate_schedule_route():
+    """Check a schedule for overlapping classes, tight building changes and credit load"""
+    data = request.get_json(silent=True) or {}
+    schedule_data = data.get('schedule')
+    if not isinstance(schedule_data, dict):
+        return jsonify({'error': 'schedule must be an object of slot -> course'}), 400
+    return jsonify(validate_schedule(schedule_data, term=str(data.get('term', '2251'))))
+
+# Largest page of schedules returned by /get-user-schedules
+MAX_SCHEDULES_PAGE = 100
+
+MAX_BUILD_COURSES = 12
+MAX_BUILD_SCHEDULES = 20
+
+@app.route('/build-schedules', methods=['POST'])
+def build_schedules_route():
+    """Generate conflict-free schedules from real UF sections"""
+    data = request.get_json(silent=True) or {}
+    courses = data.get('courses')
+    term = str(data.get('term', '2251'))
+    k = data.get('k', 5)
+
+    if not isinstance(courses, list) or not courses:
+        return jsonify({'error': 'courses must be a non-empty list'}), 400
+    if len(courses) > MAX_BUILD_COURSES:
+        return jsonify({'error': f'At most {MAX_BUILD_COURSES} courses per request'}), 400
+    if not isinstance(k, int) or not 1 <= k <= MAX_BUILD_SCHEDULES:
+        return jsonify({'error': f'k must be between 1 and {MAX_BUILD_SCHEDULES}'}), 400
+
+    result = build_schedules([str(code) for code in courses], term=term, k=k)
+    print(f"DEBUG - Built {len(result['schedules'])} schedules for {courses} "
+          f"({result['explored']} nodes, truncated={result['truncated']})")
+    return jsonify(result)
+
 @app.route('/get-user-schedules/<int:user_id>', methods=['GET'])
 def get_user_schedules(user_id):
     """Get all saved schedules for a user"""
     try:
         print(f"DEBUG - Getting schedules for user {user_id}")
-        
-        schedules = UserSchedule.query.filter_by(user_id=user_id).all()
+
+        # Optional keyset pagination: ?limit=20&cursor=<last schedule id>
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor', type=int)
+        if limit is not None and not 1 <= limit <= MAX_SCHEDULES_PAGE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_SCHEDULES_PAGE}'}), 400
+
+        # Schedules, their slots and the slot courses in two round trips
+        query = (
+            select(UserSchedule)
+            .where(UserSchedule.user_id == user_id)
+            .order_by(UserSchedule.schedule_id)
+            .options(selectinload(UserSchedule.schedule_courses).joinedload(ScheduleCourse.course))
+        )
+        if cursor is not None:
+            query = query.where(UserSchedule.schedule_id > cursor)
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        schedules = db.session.execute(query).scalars().all()
+        next_cursor = None
+        if limit is not None and len(schedules) > limit:
+            schedules = schedules[:limit]
+            next_cursor = schedules[-1].schedule_id
         print(f"DEBUG - Found {len(schedules)} schedules")
         
         result = []
         for schedule in schedules:
-            print(f"DEBUG - Processing schedule: {schedule.name} (id={schedule.schedule_id})")
-            
-            # ✅ Use schedule.schedule_courses instead of schedule.courses
-            schedule_courses = schedule.schedule_courses
-            print(f"DEBUG - Schedule has {len(schedule_courses)} courses")
-            
             schedule_data = {}
             total_credits = 0
             unique_courses = set()
             
-            for sched_course in schedule_courses:
-                if sched_course.course:
+            # Week order; slots saved before the integer times existed go last
+            slots = sorted(
+                schedule.schedule_courses,
+                key=lambda sc: (sc.start_minute is None, sc.start_minute or 0, sc.id)
+            )
+            for sched_course in slots:
+                course = sched_course.course
+                if course:
                     time_slot = f"{sched_course.day_of_week}-{sched_course.start_time}"
                     schedule_data[time_slot] = {
-                        'code': sched_course.course.course_code,
-                        'name': sched_course.course.course_name or f"Course {sched_course.course.course_code}",
-                        'credits': sched_course.course.credits or 3,
-                        'instructor': sched_course.course.professor or 'TBD',
+                        'code': course.course_code,
+                        'name': course.course_name or f"Course {course.course_code}",
+                        'credits': course.credits or 3,
+                        'instructor': course.professor or 'TBD',
                         'time': sched_course.start_time,
-                        'end_time': sched_course.end_time
+                        'end_time': sched_course.end_time,
+                        'start_minute': sched_course.start_minute,
+                        'end_minute': sched_course.end_minute
                     }
-                    unique_courses.add(sched_course.course.course_code)
-                    total_credits += sched_course.course.credits or 3
+                    unique_courses.add(course.course_code)
+                    total_credits += course.credits or 3
             
             result.append({
                 'id': schedule.schedule_id,
@@ -371,7 +515,7 @@ def get_user_schedules(user_id):
             })
         
         print(f"DEBUG - Returning {len(result)} schedules")
-        return jsonify({'schedules': result}), 200
+        return jsonify({'schedules': result, 'next_cursor': next_cursor}), 200
         
     except Exception as e:
         print(f"ERROR - Failed to get schedules: {str(e)}")
@@ -404,12 +548,7 @@ def get_user_completed_courses(user_id):
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        completed_courses = UserCompletedCourse.query.filter_by(user_id=user_id).all()
-        courses_list = []
-        
-        for uc in completed_courses:
-            if uc.course:
-                courses_list.append(uc.course.course_code)
+        courses_list = completed_codes(user_id)
 
         return jsonify({
             'completed_courses': courses_list,
@@ -420,13 +559,33 @@ def get_user_completed_courses(user_id):
         return jsonify({'error': 'Failed to get completed courses'}), 500
 # # Run server
 
+def _unavailable_course_info(course_code):
+    """Basic info returned when scraping a course fails"""
+    return {
+        'code': course_code,
+        'name': f"Course {course_code}",
+        'credits': 3,
+        'description': "Course information temporarily unavailable.",
+        'prerequisites': "Check with academic advisor",
+        'syllabus_url': None,
+        'rpm_url': None
+    }
+
+def _add_rmp_url(course_info):
+    # Copy, course info may be shared with the cache or the snapshot
+    course_info = dict(course_info)
+    if course_info.get('instructor'):
+        from syllabus_scraper import get_ratemyprofessor_search_url
+        course_info['rmp_url'] = get_ratemyprofessor_search_url(course_info['instructor'])
+    return course_info
+
+# Upper bound on codes accepted by one batch request
+MAX_COURSE_INFO_BATCH = 100
+
 @app.route('/get-course-info/<course_code>', methods=['GET'])
 def get_course_info_endpoint(course_code):
     try:
-        course_info = get_course_info(course_code)
-        if course_info.get('instructor'):
-            from syllabus_scraper import get_ratemyprofessor_search_url
-            course_info['rmp_url'] = get_ratemyprofessor_search_url(course_info['instructor'])
+        course_info = _add_rmp_url(get_course_info(course_code))
         
         return jsonify({
             'success': True,
@@ -438,16 +597,36 @@ def get_course_info_endpoint(course_code):
         # Return basic info even if scraping fails
         return jsonify({
             'success': True,
-            'course_info': {
-                'code': course_code,
-                'name': f"Course {course_code}",
-                'credits': 3,
-                'description': "Course information temporarily unavailable.",
-                'prerequisites': "Check with academic advisor",
-                'syllabus_url': None,
-                'rpm_url': None
-            }
+            'course_info': _unavailable_course_info(course_code)
         })
+
+@app.route('/get-course-info/batch', methods=['POST'])
+def get_course_info_batch_endpoint():
+    """Get course info for many courses in one round trip"""
+    data = request.get_json(silent=True) or {}
+    codes = data.get('codes')
+    if not isinstance(codes, list):
+        return jsonify({'error': 'codes must be a list of course codes'}), 400
+    if len(codes) > MAX_COURSE_INFO_BATCH:
+        return jsonify({'error': f'At most {MAX_COURSE_INFO_BATCH} codes per request'}), 400
+
+    codes = [str(code).strip() for code in codes if code is not None and str(code).strip()]
+    try:
+        infos = get_course_infos(codes)
+    except Exception as e:
+        print(f"Error getting course info batch: {str(e)}")
+        infos = {}
+
+    course_info = {}
+    for code in codes:
+        if code not in course_info:
+            info = infos.get(normalize_course_code(code))
+            course_info[code] = _add_rmp_url(info) if info else _unavailable_course_info(code)
+
+    return jsonify({
+        'success': True,
+        'course_info': course_info
+    })
     
 
     
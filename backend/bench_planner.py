@@ -0,0 +1,64 @@
+"""
+Benchmark the degree planner against the full ENG and CLAS catalogs.
+
+Runs plan_degree for several transcripts with the memo cache cleared on
+every call (so each run does the full planning work) and fails if the
+slowest run is not well under the 100 ms budget.
+
+Usage:
+    python bench_planner.py --runs 200
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import degree_planner
+from degree_planner import plan_degree
+
+BUDGET_MS = 100
+
+TRANSCRIPTS = {
+    'empty': [],
+    'first year': ['MAC2311', 'MAC2312', 'COP3502C', 'ENC2256'],
+    'halfway': ['MAC2311', 'MAC2312', 'MAC2313', 'COP3502C', 'COP3503C', 'COT3100',
+                'PHY2048', 'PHY2048L', 'STA3032', 'ENC3246'],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark degree plan generation')
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--electives', type=int, default=5)
+    parser.add_argument('--max-credits', type=int, default=15)
+    args = parser.parse_args()
+
+    worst = 0.0
+    for college in ('ENG', 'CLAS'):
+        for name, transcript in TRANSCRIPTS.items():
+            timings = []
+            for _ in range(args.runs):
+                degree_planner._plan.cache_clear()
+                start = time.perf_counter()
+                plan = plan_degree(college, transcript, max_credits=args.max_credits, electives=args.electives)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            worst = max(worst, timings[-1])
+            print(f"{college:4} {name:10} terms={plan['total_terms']} (bound {plan['lower_bound_terms']}) "
+                  f"median={statistics.median(timings):.3f} ms p99={p99:.3f} ms max={timings[-1]:.3f} ms")
+
+    # Memoized path, what repeat requests for the same transcript cost
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        plan_degree('ENG', TRANSCRIPTS['halfway'], electives=args.electives)
+    print(f"memoized: {(time.perf_counter() - start) * 1000 / args.runs:.4f} ms per call")
+
+    if worst >= BUDGET_MS:
+        print(f"FAIL: slowest plan took {worst:.1f} ms (budget {BUDGET_MS} ms)")
+        sys.exit(1)
+    print(f"OK: slowest plan {worst:.3f} ms (budget {BUDGET_MS} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark the schedule builder on synthetic UF-style section listings.
+
+Generates courses whose sections sit on real UF period times (MWF single
+periods, MW and TR double periods) and runs two checks:
+1. Speed: builds the top k schedules for each listing with the normal
+   search budget and fails if any build is cut off by the budget
+   (truncated) or takes longer than BUDGET_SECONDS, so the time measured
+   is the search itself and not the anytime cut-off
+2. Quality: on small listings, compares the top k scores against an
+   exhaustive search over every combination and fails on any difference
+   or on a returned schedule with overlapping sections
+
+The default listing is the target size, 10 courses x 20 sections. The
+search does not finish that within the budget yet, so the benchmark fails
+at its defaults; 8 courses x 20 sections passes.
+
+Usage:
+    python bench_schedule_builder.py --courses 10 --sections 20
+"""
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from schedule_builder import SEARCH_BUDGET_SECONDS, build_schedules, compile_options, score_schedule
+from uf_api_service import format_time
+
+BUDGET_SECONDS = 1.0
+
+PERIODS = [('0725', '0815'), ('0830', '0920'), ('0935', '1025'), ('1040', '1130'), ('1145', '1235'),
+           ('1250', '1340'), ('1355', '1445'), ('1500', '1550'), ('1605', '1655'), ('1710', '1800'),
+           ('1815', '1905')]
+PATTERNS = [['Monday', 'Wednesday', 'Friday'], ['Monday', 'Wednesday'], ['Tuesday', 'Thursday']]
+
+
+def synthetic_sections(courses, sections_per_course, rng):
+    listing = {}
+    for c in range(courses):
+        code = f"BEN{1000 + c}"
+        sections = []
+        for s in range(sections_per_course):
+            days = rng.choice(PATTERNS)
+            period = rng.randrange(len(PERIODS))
+            begin, end = PERIODS[period]
+            if len(days) == 2:
+                # Two meetings a week run a double period
+                end = PERIODS[min(period + 1, len(PERIODS) - 1)][1]
+            sections.append({
+                'course_code': code,
+                'section': str(10000 + c * 100 + s),
+                'instructor': 'TBD',
+                'days': days,
+                'start_time': format_time(begin),
+                'end_time': format_time(end),
+                'building': 'TBD',
+                'room': '',
+                'credits': 3,
+            })
+        listing[code] = sections
+    return listing
+
+
+def exhaustive_scores(listing, k):
+    """Best k scores over every conflict-free combination, by brute force"""
+    options = [compile_options(code, sections) for code, sections in listing.items()]
+    scores = []
+    for combo in itertools.product(*[course for course in options if course]):
+        occupied = 0
+        for option in combo:
+            if occupied & option.mask:
+                break
+            occupied |= option.mask
+        else:
+            scores.append(score_schedule(list(combo))['score'])
+    return sorted(scores)[:k]
+
+
+def has_overlap(schedule):
+    """True if two sections of a built schedule share a time slot"""
+    occupied = 0
+    for section in schedule['sections']:
+        option = compile_options(section['course_code'], [section])[0]
+        if occupied & option.mask:
+            return True
+        occupied |= option.mask
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark conflict-free schedule generation')
+    parser.add_argument('--courses', type=int, default=10)
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--verify-courses', type=int, default=5,
+                        help='listing size for the exhaustive comparison (sections ** courses combinations)')
+    parser.add_argument('--verify-sections', type=int, default=7)
+    args = parser.parse_args()
+
+    failures = []
+
+    print(f"Speed: {args.courses} courses x {args.sections} sections, search budget {SEARCH_BUDGET_SECONDS} s")
+    worst = 0.0
+    for seed in range(args.runs):
+        listing = synthetic_sections(args.courses, args.sections, random.Random(seed))
+        start = time.perf_counter()
+        result = build_schedules(list(listing), sections=listing, k=args.k)
+        elapsed = time.perf_counter() - start
+        worst = max(worst, elapsed)
+        scores = [schedule['score'] for schedule in result['schedules']]
+        status = 'truncated' if result['truncated'] else 'finished'
+        print(f"  seed {seed}: {elapsed * 1000:.0f} ms, {result['explored']} nodes, {status}, scores={scores}")
+        if result['truncated']:
+            failures.append(f"speed seed {seed}: search cut off by the budget before finishing")
+    if worst >= BUDGET_SECONDS:
+        failures.append(f"slowest build took {worst:.2f} s (budget {BUDGET_SECONDS} s)")
+
+    print(f"Quality: {args.verify_courses} courses x {args.verify_sections} sections vs exhaustive search")
+    for seed in range(args.runs):
+        listing = synthetic_sections(args.verify_courses, args.verify_sections, random.Random(1000 + seed))
+        # No budget here, the comparison is only meaningful for a finished search
+        result = build_schedules(list(listing), sections=listing, k=args.k, budget=float('inf'))
+        scores = [schedule['score'] for schedule in result['schedules']]
+        expected = exhaustive_scores(listing, args.k)
+        match = scores == expected
+        print(f"  seed {seed}: scores={scores}, exhaustive={expected}, {'match' if match else 'MISMATCH'}")
+        if not match:
+            failures.append(f"quality seed {seed}: top {args.k} scores {scores} != exhaustive {expected}")
+        if any(has_overlap(schedule) for schedule in result['schedules']):
+            failures.append(f"quality seed {seed}: a returned schedule has overlapping sections")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print(f"OK: slowest build {worst:.2f} s (budget {BUDGET_SECONDS} s), searches finished, "
+          f"top {args.k} scores match exhaustive search")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Worker pool with an admission limit, for slow work a request waits on.
+
+At most max_pending calls are queued or running at once; past that the
+caller's busy exception is raised right away instead of queueing more
+work behind a full pool. A call's slot is freed when its work finishes,
+not when the caller stops waiting, so work abandoned on a timeout still
+counts against the limit until it is done.
+
+Used by transcript_parser (processes) and password_hasher (threads).
+"""
+import threading
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Type
+
+
+class BoundedPool:
+    def __init__(self, make_executor: Callable[[], Executor], max_pending: int, timeout: float,
+                 busy: Type[Exception], busy_message: str):
+        """
+        Args:
+            make_executor: builds the executor, called on first use so
+                importing a module doesn't start workers
+            max_pending: calls allowed to be queued or running at once
+            timeout: seconds a caller waits for its result
+            busy: exception raised when max_pending calls are in flight
+            busy_message: message of that exception
+        """
+        self.make_executor = make_executor
+        self.timeout = timeout
+        self.busy = busy
+        self.busy_message = busy_message
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(max_pending)
+
+    def executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = self.make_executor()
+            return self._executor
+
+    def run(self, fn, *args):
+        """
+        Run fn(*args) on the pool and wait for its result.
+
+        Raises:
+            busy: max_pending calls are already in flight
+            concurrent.futures.TimeoutError: no result within timeout
+            whatever fn raises
+        """
+        if not self._pending.acquire(blocking=False):
+            raise self.busy(self.busy_message)
+        try:
+            future = self.executor().submit(fn, *args)
+        except Exception:
+            self._pending.release()
+            raise
+        # The slot is freed when the work finishes, even if the caller gave up waiting
+        future.add_done_callback(lambda _: self._pending.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drops the work if it hasn't started yet
+            future.cancel()
+            raise
@@ -0,0 +1,256 @@
+"""
+Pluggable cache backends for scraped course and syllabus data.
+
+Two stores share the same interface:
+1. MemoryCache - per-process LRU dict, the old behaviour
+2. SQLiteCache - file-backed store shared by every worker on the host and
+   kept across restarts
+
+Both keep per-entry freshness metadata (when it was stored, when it
+expires, when it was last read), honour TTLs and evict the least recently
+used entries once max_entries is exceeded. Values are handed out as copies,
+so callers can modify what they get back without changing the cache.
+
+SQLiteCache keeps reads cheap across workers: the last-read time is only
+written when it is more than ACCESS_RESOLUTION seconds old, so a hot key
+doesn't take the write lock on every hit, and expired or excess entries are
+swept every EVICT_EVERY writes instead of counting rows on each one (a
+namespace can briefly hold up to EVICT_EVERY entries over max_entries).
+
+The backend is picked with the COURSE_CACHE_BACKEND environment variable
+("memory" or "sqlite"); the SQLite file lives at COURSE_CACHE_PATH.
+"""
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'course_cache.sqlite3')
+
+# LRU order only needs to be this precise (seconds)
+ACCESS_RESOLUTION = 60
+# Writes between eviction sweeps of a SQLite namespace
+EVICT_EVERY = 64
+
+
+class CacheEntry:
+    """A cached value plus its freshness metadata"""
+    __slots__ = ('value', 'stored_at', 'expires_at', 'accessed_at')
+
+    def __init__(self, value: Any, stored_at: float, expires_at: Optional[float], accessed_at: float):
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.accessed_at = accessed_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+
+class MemoryCache:
+    """In-process LRU cache with TTLs"""
+
+    def __init__(self, namespace: str, ttl: Optional[float] = None, max_entries: int = 5000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            if entry.is_expired(now):
+                del self._entries[key]
+                return None
+            entry.accessed_at = now
+            self._entries.move_to_end(key)
+            return CacheEntry(copy.deepcopy(entry.value), entry.stored_at, entry.expires_at, now)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return entry.value if entry else default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            self._entries[key] = CacheEntry(copy.deepcopy(value), now, now + ttl if ttl else None, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_entry(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    SQLite-backed LRU cache with TTLs.
+
+    Values are stored as JSON. Each thread gets its own connection and the
+    database runs in WAL mode so several gunicorn workers can read and write
+    the same file at once.
+    """
+
+    def __init__(self, namespace: str, ttl: Optional[float] = None, max_entries: int = 5000,
+                 path: str = DEFAULT_CACHE_PATH):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS ix_cache_entries_lru
+            ON cache_entries (namespace, accessed_at)
+        """)
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT value, stored_at, expires_at, accessed_at FROM cache_entries WHERE namespace = ? AND key = ?',
+            (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        value, stored_at, expires_at, accessed_at = row
+        if expires_at is not None and now >= expires_at:
+            self.delete(key)
+            return None
+
+        # Reads stay read-only unless the LRU timestamp is noticeably out of date
+        if now - accessed_at >= ACCESS_RESOLUTION:
+            conn.execute(
+                'UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                (now, self.namespace, key)
+            )
+            accessed_at = now
+        return CacheEntry(json.loads(value), stored_at, expires_at, accessed_at)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return entry.value if entry else default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entries '
+            '(namespace, key, value, stored_at, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (self.namespace, key, json.dumps(value), now, now + ttl if ttl else None, now)
+        )
+        with self._writes_lock:
+            self._writes += 1
+            sweep = self._writes >= EVICT_EVERY
+            if sweep:
+                self._writes = 0
+        if sweep:
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            'DELETE FROM cache_entries WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?',
+            (self.namespace, now)
+        )
+        (count,) = conn.execute(
+            'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+        ).fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                'DELETE FROM cache_entries WHERE namespace = ? AND key IN ('
+                '  SELECT key FROM cache_entries WHERE namespace = ? ORDER BY accessed_at LIMIT ?'
+                ')',
+                (self.namespace, self.namespace, count - self.max_entries)
+            )
+
+    def delete(self, key: str) -> None:
+        self._connect().execute(
+            'DELETE FROM cache_entries WHERE namespace = ? AND key = ?', (self.namespace, key)
+        )
+
+    def clear(self) -> None:
+        self._connect().execute('DELETE FROM cache_entries WHERE namespace = ?', (self.namespace,))
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_entry(key) is not None
+
+    def __len__(self) -> int:
+        (count,) = self._connect().execute(
+            'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+        ).fetchone()
+        return count
+
+
+CACHE_BACKENDS: Dict[str, type] = {
+    'memory': MemoryCache,
+    'sqlite': SQLiteCache,
+}
+
+
+def get_cache(namespace: str, ttl: Optional[float] = None, max_entries: int = 5000):
+    """Build the cache backend configured through COURSE_CACHE_BACKEND"""
+    backend = os.getenv('COURSE_CACHE_BACKEND', 'sqlite').lower()
+    if backend not in CACHE_BACKENDS:
+        print(f"Unknown COURSE_CACHE_BACKEND '{backend}', falling back to memory")
+        backend = 'memory'
+
+    if backend == 'sqlite':
+        path = os.getenv('COURSE_CACHE_PATH', DEFAULT_CACHE_PATH)
+        try:
+            return SQLiteCache(namespace, ttl=ttl, max_entries=max_entries, path=path)
+        except sqlite3.Error as e:
+            print(f"Could not open cache database {path}: {str(e)}, falling back to memory")
+            return MemoryCache(namespace, ttl=ttl, max_entries=max_entries)
+
+    return MemoryCache(namespace, ttl=ttl, max_entries=max_entries)
@@ -0,0 +1,159 @@
+"""
+Set-based database operations on courses and completed courses.
+
+Every helper here issues a fixed number of statements no matter how many
+course codes it is given, instead of one query (and flush) per code.
+
+Each user's completed course codes are also cached (see cache_backend.py)
+so recommendation requests don't reload the transcript every time;
+save_transcript invalidates the entry once its changes are committed.
+"""
+import os
+import re
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select
+
+from cache_backend import get_cache
+from models import db, Course, UserCompletedCourse
+
+# Matches courses.course_code VARCHAR(20)
+MAX_COURSE_CODE_LENGTH = 20
+
+COMPLETED_CACHE_TTL = int(os.getenv('COMPLETED_CACHE_TTL', 60 * 60))
+completed_cache = get_cache('completed_courses', ttl=COMPLETED_CACHE_TTL,
+                            max_entries=int(os.getenv('COMPLETED_CACHE_MAX_ENTRIES', 10000)))
+
+
+def normalize_codes(raw_codes: Iterable) -> List[str]:
+    """Remove whitespace, uppercase and de-duplicate course codes, keeping order"""
+    normalized = []
+    seen = set()
+    for raw in raw_codes:
+        if raw is None:
+            continue
+        code = re.sub(r"\s+", "", str(raw)).upper()
+        if not code or code in seen:
+            continue
+        seen.add(code)
+        normalized.append(code)
+    return normalized
+
+
+def insert_ignore(model):
+    """INSERT ... ON CONFLICT DO NOTHING for the configured database"""
+    if db.engine.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(model)
+
+
+def resolve_courses(course_rows: Dict[str, Dict]) -> Dict[str, int]:
+    """
+    Find or create courses in bulk.
+
+    Args:
+        course_rows: course code -> column values used if the course has to be created
+
+    Returns:
+        course code -> course_id
+    """
+    if not course_rows:
+        return {}
+
+    codes = list(course_rows)
+    course_ids = dict(db.session.execute(
+        select(Course.course_code, Course.course_id).where(Course.course_code.in_(codes))
+    ).all())
+
+    missing = [code for code in codes if code not in course_ids]
+    if missing:
+        stmt = insert_ignore(Course).values([
+            {'course_code': code, **course_rows[code]} for code in missing
+        ]).on_conflict_do_nothing(index_elements=['course_code']).returning(
+            Course.course_code, Course.course_id
+        )
+        course_ids.update(dict(db.session.execute(stmt).all()))
+
+        # Courses created by a concurrent request are not returned, look them up
+        raced = [code for code in missing if code not in course_ids]
+        if raced:
+            course_ids.update(dict(db.session.execute(
+                select(Course.course_code, Course.course_id).where(Course.course_code.in_(raced))
+            ).all()))
+
+    return course_ids
+
+
+def ingest_transcript(user_id: int, raw_codes: Iterable) -> Dict:
+    """
+    Link a user to every course in a transcript.
+
+    Missing courses are created and already-completed courses are skipped,
+    using one lookup, one multi-row insert for courses and one multi-row
+    insert for user_completed_courses. The caller commits.
+
+    Returns:
+        dict with saved_count, total_courses, skipped and errors
+    """
+    normalized = normalize_codes(raw_codes)
+
+    errors: List[str] = []
+    valid = []
+    for code in normalized:
+        if len(code) > MAX_COURSE_CODE_LENGTH:
+            errors.append(f"Error processing {code}: course code longer than {MAX_COURSE_CODE_LENGTH} characters")
+        else:
+            valid.append(code)
+
+    course_ids = resolve_courses({
+        code: {'course_name': f"Course {code}", 'credits': 3} for code in valid
+    })
+
+    saved_course_ids = set()
+    if course_ids:
+        stmt = insert_ignore(UserCompletedCourse).values([
+            {'user_id': user_id, 'course_id': course_ids[code]} for code in valid if code in course_ids
+        ]).on_conflict_do_nothing(index_elements=['user_id', 'course_id']).returning(
+            UserCompletedCourse.course_id
+        )
+        saved_course_ids = set(db.session.execute(stmt).scalars().all())
+
+    skipped = [code for code in valid if code in course_ids and course_ids[code] not in saved_course_ids]
+    for code in valid:
+        if code not in course_ids:
+            errors.append(f"Error processing {code}: course could not be created")
+
+    return {
+        'saved_count': len(saved_course_ids),
+        'total_courses': len(normalized),
+        'skipped': skipped,
+        'errors': errors,
+    }
+
+
+
+def load_completed_codes(user_id: int) -> List[str]:
+    """A user's completed course codes, in one joined query"""
+    return list(db.session.execute(
+        select(Course.course_code)
+        .join(UserCompletedCourse, UserCompletedCourse.course_id == Course.course_id)
+        .where(UserCompletedCourse.user_id == user_id)
+        .order_by(Course.course_code)
+    ).scalars().all())
+
+
+def completed_codes(user_id: int) -> List[str]:
+    """A user's completed course codes, from the cache when possible"""
+    key = str(user_id)
+    codes = completed_cache.get(key)
+    if codes is None:
+        codes = load_completed_codes(user_id)
+        completed_cache.set(key, codes)
+    return list(codes)
+
+
+def invalidate_completed(user_id: int) -> None:
+    """Drop the cached codes once a user's completed courses changed (after commit)"""
+    completed_cache.delete(str(user_id))
@@ -1,10 +1,21 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 from syllabus_scraper import get_syllabus_info
+from cache_backend import get_cache
+import http_client
+
+# How long a parsed department page is trusted before it is downloaded again
+CATALOG_INDEX_TTL = int(os.getenv('CATALOG_INDEX_TTL', 6 * 60 * 60))
+
+def normalize_course_code(course_code):
+    """Remove whitespace and uppercase a course code (\"cop 3502c\" -> \"COP3502C\")"""
+    return re.sub(r'\s+', '', str(course_code or '')).upper()
 
 class UFCourseScraper:
     def __init__(self):
@@ -20,51 +31,23 @@ class UFCourseScraper:
             'MAC': "https://catalog.ufl.edu/UGRD/courses/mathematics/",
             'CAI': "https://catalog.ufl.edu/UGRD/courses/computer_and_information_science_and_engineering/",
         }
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
     
     def get_department_from_course(self, course_code):
         """Extract department prefix from course code"""
         match = re.match(r'^([A-Z]{2,4})', course_code.upper())
         return match.group(1) if match else 'CISE'
     
-    def scrape_course_catalog(self, course_code):
-        """Scrape course information from UF catalog"""
-        department = self.get_department_from_course(course_code)
-        
-        # Try the specific department first, then fall back to CISE
-        urls_to_try = []
-        if department in self.catalog_urls:
-            urls_to_try.append(self.catalog_urls[department])
-        
-        # Add CISE as fallback if not already tried
-        if department != 'CISE':
-            urls_to_try.append(self.catalog_urls['CISE'])
-        
-        # Try all catalog URLs if specific department not found
-        for dept_url in self.catalog_urls.values():
-            if dept_url not in urls_to_try:
-                urls_to_try.append(dept_url)
-        
-        course_info = None
-        for url in urls_to_try:
-            try:
-                print(f"Searching for {course_code} in {url}")
-                response = self.session.get(url, timeout=10)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                course_info = self._find_course_in_page(soup, course_code)
-                
-                if course_info:
-                    print(f"Found {course_code} in {url}")
-                    break
-                    
-            except Exception as e:
-                print(f"Error searching {url} for {course_code}: {str(e)}")
-                continue
+    def scrape_course_catalog(self, course_code, raise_errors=False):
+        """
+        Scrape course information from UF catalog.
+
+        With raise_errors, a catalog page that can't be downloaded raises
+        instead of reading as "course not found".
+        """
+        # Department pages are parsed once into the shared catalog index
+        course_info = catalog_index.lookup(course_code, raise_errors=raise_errors)
+        if course_info:
+            course_info = dict(course_info)
         
         # Get syllabus info separately
         syllabus_info = get_syllabus_info(course_code)
@@ -77,6 +60,8 @@ class UFCourseScraper:
                     course_info['instructor'] = syllabus_info['instructor']
                 if syllabus_info.get('syllabus_url'):
                     course_info['syllabus_url'] = syllabus_info['syllabus_url']
+                if syllabus_info.get('offerings'):
+                    course_info['offerings'] = syllabus_info['offerings']
             return course_info
         elif syllabus_info:
             # Only syllabus info available
@@ -88,34 +73,56 @@ class UFCourseScraper:
                 'prerequisites': "",
                 'grading_scheme': "Letter Grade",
                 'instructor': syllabus_info.get('instructor', 'TBD'),
-                'syllabus_url': syllabus_info.get('syllabus_url')
+                'syllabus_url': syllabus_info.get('syllabus_url'),
+                'offerings': syllabus_info.get('offerings', [])
             }
         
         print(f"Course {course_code} not found in any catalog")
         return None
     
-    def _find_course_in_page(self, soup, course_code):
-        """Find course in the parsed page"""
-        # Look for course blocks
-        course_blocks = soup.find_all('div', class_='courseblock')
+    def catalog_urls_for(self, course_code):
+        """Distinct department pages to search for a course, most likely first"""
+        department = self.get_department_from_course(course_code)
+        
+        # Try the specific department first, then fall back to CISE
+        urls_to_try = []
+        if department in self.catalog_urls:
+            urls_to_try.append(self.catalog_urls[department])
+        
+        # Add CISE as fallback if not already tried
+        if self.catalog_urls['CISE'] not in urls_to_try:
+            urls_to_try.append(self.catalog_urls['CISE'])
+        
+        # Try all catalog URLs if specific department not found
+        for dept_url in self.catalog_urls.values():
+            if dept_url not in urls_to_try:
+                urls_to_try.append(dept_url)
         
-        for block in course_blocks:
+        return urls_to_try
+    
+    def index_page(self, soup):
+        """Parse every course block in a catalog page into a dict keyed by course code"""
+        courses = {}
+        for block in soup.find_all('div', class_='courseblock'):
             course_title = block.find('p', class_='courseblocktitle')
             if not course_title:
                 continue
-                
-            title_text = course_title.get_text(strip=True)
             
-            # More flexible matching - remove spaces and compare
-            clean_title = re.sub(r'\s+', '', title_text.upper())
-            clean_course_code = re.sub(r'\s+', '', course_code.upper())
+            course_info = self._parse_course_block(block, course_title.get_text(strip=True))
+            if not course_info:
+                continue
             
-            if clean_course_code in clean_title:
-                course_info = self._parse_course_block(block, title_text)
-                if course_info:
-                    return course_info
+            code = normalize_course_code(course_info['code'])
+            course_info['code'] = code
+            courses[code] = course_info
         
-        return None
+        # Also answer lookups without the lab/combined suffix (COP3502 -> COP3502C)
+        for code, course_info in list(courses.items()):
+            match = re.match(r'^([A-Z]{2,4}\d{4})[A-Z]+$', code)
+            if match and match.group(1) not in courses:
+                courses[match.group(1)] = course_info
+        
+        return courses
     
     def _parse_course_block(self, block, title_text):
         """Parse individual course block"""
@@ -217,35 +224,248 @@ class UFCourseScraper:
             traceback.print_exc()
             return None
 
-# Cache to store scraped data
-course_cache = {}
+class CatalogIndex:
+    """
+    Course-code index over the UF catalog department pages.
+
+    Every distinct department page is downloaded and parsed at most once per
+    TTL window; all of its course blocks are kept in a dict keyed by the
+    normalized course code so lookups are O(1).
+    """
+    def __init__(self, scraper=None, ttl=CATALOG_INDEX_TTL):
+        self.scraper = scraper or UFCourseScraper()
+        self.ttl = ttl
+        self._pages = {}  # url -> (loaded_at, {course_code: course_info}, PageValidators)
+        self._lock = threading.Lock()
+        self._url_locks = {}
+
+    def _url_lock(self, url):
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _is_fresh(self, url):
+        entry = self._pages.get(url)
+        return entry is not None and (self.ttl is None or time.time() - entry[0] < self.ttl)
+
+    def page(self, url, raise_errors=False):
+        """
+        Return the course dict for a department page, loading it if missing or expired.
+
+        A page that can't be downloaded comes back empty (or as the previous
+        copy), unless raise_errors is set.
+        """
+        if self._is_fresh(url):
+            return self._pages[url][1]
+
+        # One download per page even when several requests miss at once
+        with self._url_lock(url):
+            if self._is_fresh(url):
+                return self._pages[url][1]
+            previous = self._pages.get(url)
+            try:
+                print(f"Indexing catalog page {url}")
+                response, validators = http_client.get_if_changed(
+                    url, previous[2] if previous else None, timeout=10
+                )
+                if response is None:
+                    # Page unchanged since the last parse, just extend its lifetime
+                    print(f"Catalog page unchanged: {url}")
+                    self._pages[url] = (time.time(), previous[1], validators)
+                    return previous[1]
+                soup = BeautifulSoup(response.content, 'html.parser')
+                courses = self.scraper.index_page(soup)
+                print(f"Indexed {len(courses)} courses from {url}")
+            except Exception as e:
+                print(f"Error indexing {url}: {str(e)}")
+                if raise_errors:
+                    raise
+                # Keep serving the previous copy if we have one
+                if previous:
+                    return previous[1]
+                return {}
+            self._pages[url] = (time.time(), courses, validators)
+            return courses
+
+    def lookup(self, course_code, raise_errors=False):
+        """Find a course in the catalog, trying its own department page first"""
+        code = normalize_course_code(course_code)
+        for url in self.scraper.catalog_urls_for(code):
+            course_info = self.page(url, raise_errors=raise_errors).get(code)
+            if course_info:
+                print(f"Found {code} in {url}")
+                return course_info
+        return None
+
+    def refresh(self, url=None):
+        """Drop one page (or every page) so the next lookup downloads it again"""
+        with self._lock:
+            if url is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(url, None)
+
+catalog_index = CatalogIndex()
+
+# Cache to store scraped data, shared across workers (see cache_backend.py)
+COURSE_CACHE_TTL = int(os.getenv('COURSE_CACHE_TTL', 24 * 60 * 60))
+# Courses we could not find are retried sooner
+COURSE_NOT_FOUND_TTL = int(os.getenv('COURSE_NOT_FOUND_TTL', 60 * 60))
+course_cache = get_cache('course_info', ttl=COURSE_CACHE_TTL,
+                         max_entries=int(os.getenv('COURSE_CACHE_MAX_ENTRIES', 5000)))
+
+# Stale-while-revalidate: entries older than the soft TTL are still served
+# (marked 'stale') while a background worker scrapes a fresh copy
+COURSE_STALE_WHILE_REVALIDATE = os.getenv('COURSE_STALE_WHILE_REVALIDATE', 'True') == 'True'
+COURSE_SOFT_TTL = int(os.getenv('COURSE_SOFT_TTL', 6 * 60 * 60))
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('COURSE_REFRESH_WORKERS', 2)),
+    thread_name_prefix='course-refresh'
+)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+# Striped locks so concurrent misses for one code start a single scrape
+_scrape_locks = [threading.Lock() for _ in range(64)]
+
+# Offline snapshot installed at startup (see course_snapshot.py)
+_snapshot = None
+
+def use_snapshot(snapshot):
+    """Serve course info from a prebuilt snapshot instead of scraping"""
+    global _snapshot
+    _snapshot = snapshot
 
 def get_course_info(course_code):
     """Get course information with caching"""
-    if course_code in course_cache:
-        return course_cache[course_code]
+    cache_key = normalize_course_code(course_code)
+    if _snapshot is not None:
+        course_info = _snapshot.courses.get(cache_key)
+        return dict(course_info) if course_info else _not_found_course_info(course_code)
     
-    scraper = UFCourseScraper()
-    course_info = scraper.scrape_course_catalog(course_code)
+    cached = _cached_course_info(cache_key, course_code)
+    if cached is not None:
+        return cached
     
-    if course_info:
-        course_cache[course_code] = course_info
-        # Add delay to be respectful to the server
-        time.sleep(0.5)
-    else:
-        # Cache a basic response for courses we can't find - default to 3 credits
-        course_cache[course_code] = {
-            'code': course_code,
-            'name': f"Course {course_code}",
-            'credits': 3,  # Default to 3 credits
-            'description': "Course information not available in the catalog.",
-            'prerequisites': "Check with academic advisor",
-            'grading_scheme': "Letter Grade",
-            'instructor': "TBD",
-            'syllabus_url': None
-        }
+    return _scrape_course_info(cache_key, course_code)
+
+def _cached_course_info(cache_key, course_code):
+    """Cached course info, kicking off a background refresh if it is past the soft TTL"""
+    entry = course_cache.get_entry(cache_key)
+    if entry is None:
+        return None
     
-    return course_cache[course_code]
+    if COURSE_STALE_WHILE_REVALIDATE and entry.age >= COURSE_SOFT_TTL:
+        _schedule_refresh(cache_key, course_code)
+        return dict(entry.value, stale=True)
+    
+    return entry.value
+
+def _scrape_course_info(cache_key, course_code):
+    """Scrape a course and store it, only one thread per code at a time"""
+    with _scrape_locks[hash(cache_key) % len(_scrape_locks)]:
+        # Another thread may have stored a fresh copy while we waited
+        entry = course_cache.get_entry(cache_key)
+        if entry is not None and entry.age < COURSE_SOFT_TTL:
+            return entry.value
+        
+        try:
+            # A refresh has a good copy to fall back on, so tell a failed download from a missing course
+            course_info = catalog_index.scraper.scrape_course_catalog(course_code, raise_errors=entry is not None)
+        except Exception as e:
+            print(f"Error refreshing {course_code}, keeping the cached copy: {str(e)}")
+            return entry.value
+        
+        if course_info:
+            course_cache.set(cache_key, course_info)
+        elif entry is not None:
+            # Never replace real course info with the not-found placeholder
+            return entry.value
+        else:
+            # Cache a basic response for courses we can't find
+            course_info = _not_found_course_info(course_code)
+            course_cache.set(cache_key, course_info, ttl=COURSE_NOT_FOUND_TTL)
+        
+        return course_info
+
+def _schedule_refresh(cache_key, course_code):
+    """Refresh a stale entry in the background unless a refresh is already running"""
+    with _refreshing_lock:
+        if cache_key in _refreshing:
+            return
+        _refreshing.add(cache_key)
+    
+    def refresh():
+        try:
+            print(f"Refreshing stale course info for {course_code}")
+            with http_client.background_requests():
+                _scrape_course_info(cache_key, course_code)
+        except Exception as e:
+            print(f"Error refreshing course info for {course_code}: {str(e)}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(cache_key)
+    
+    _refresh_executor.submit(refresh)
+
+def _not_found_course_info(course_code):
+    """Basic response for courses we can't find - default to 3 credits"""
+    return {
+        'code': course_code,
+        'name': f"Course {course_code}",
+        'credits': 3,  # Default to 3 credits
+        'description': "Course information not available in the catalog.",
+        'prerequisites': "Check with academic advisor",
+        'grading_scheme': "Letter Grade",
+        'instructor': "TBD",
+        'syllabus_url': None
+    }
+
+# Bounded pool used to resolve batch cache misses concurrently
+COURSE_BATCH_WORKERS = int(os.getenv('COURSE_BATCH_WORKERS', 4))
+_batch_executor = ThreadPoolExecutor(max_workers=COURSE_BATCH_WORKERS, thread_name_prefix='course-batch')
 
+def get_course_infos(course_codes):
+    """
+    Get course information for many course codes at once.
 
+    Codes are de-duplicated, cache hits are answered directly and misses are
+    grouped by department page so each page is scraped by a single worker.
+    Returns a dict keyed by normalized course code.
+    """
+    requested = {}
+    for raw in course_codes:
+        if raw is None:
+            continue
+        code = str(raw).strip()
+        if code:
+            requested.setdefault(normalize_course_code(code), code)
+
+    results = {}
+    misses_by_page = {}
+    scraper = catalog_index.scraper
+    for cache_key, code in requested.items():
+        if _snapshot is not None:
+            results[cache_key] = get_course_info(code)
+            continue
+        cached = _cached_course_info(cache_key, course_code=code)
+        if cached is not None:
+            results[cache_key] = cached
+        else:
+            page_url = scraper.catalog_urls_for(cache_key)[0]
+            misses_by_page.setdefault(page_url, []).append(code)
+
+    def resolve_page(page_url, codes):
+        # Warm the department page once, then every lookup on it is a dict hit
+        catalog_index.page(page_url)
+        return {normalize_course_code(code): get_course_info(code) for code in codes}
+
+    futures = [
+        _batch_executor.submit(resolve_page, page_url, codes)
+        for page_url, codes in misses_by_page.items()
+    ]
+    for future in futures:
+        try:
+            results.update(future.result())
+        except Exception as e:
+            print(f"Error resolving course info batch: {str(e)}")
 
+    return results
@@ -0,0 +1,319 @@
+"""
+Offline course data snapshots.
+
+A snapshot holds everything the app would otherwise scrape at request
+time: merged catalog + syllabus course info, every CISE syllabus offering
+and the UF Schedule of Courses sections for one term. It is built ahead of
+time (e.g. in CI) and loaded at startup through COURSE_SNAPSHOT_PATH, after
+which course info and sections are served with zero outbound calls.
+
+File format: gzip-compressed JSON. Records are stored as fixed-order rows
+and every string is replaced by its index in a shared string table, so the
+many repeated values (instructors, departments, buildings, defaults) are
+stored once.
+
+Usage:
+    python course_snapshot.py build --term 2251 --output course_snapshot.json.gz
+    python course_snapshot.py info course_snapshot.json.gz
+
+build exits with status 1 and writes nothing if any catalog page, the
+syllabus page or a course's sections can't be downloaded.
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import course_scraper
+import http_client
+import syllabus_scraper
+import uf_api_service
+from requirement_catalog import requirement_catalog
+from time_model import meeting_fields
+
+SNAPSHOT_FORMAT = 'plan-a-gator-course-snapshot'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SECTION_WORKERS = 4
+
+
+class SnapshotBuildError(RuntimeError):
+    """A source could not be downloaded, the snapshot would be incomplete"""
+
+# Field name -> kind: 's' string (table index), 'v' raw JSON value, 'ls' list of strings
+COURSE_FIELDS = [
+    ('code', 's'), ('name', 's'), ('credits', 'v'), ('description', 's'),
+    ('prerequisites', 's'), ('grading_scheme', 's'), ('instructor', 's'), ('syllabus_url', 's'),
+]
+OFFERING_FIELDS = [
+    ('course_title', 's'), ('sections', 's'), ('instructor', 's'),
+    ('semester', 's'), ('year', 's'), ('syllabus_url', 's'),
+]
+SECTION_FIELDS = [
+    ('course_code', 's'), ('section', 'v'), ('instructor', 's'), ('days', 'ls'),
+    ('start_time', 's'), ('end_time', 's'), ('building', 's'), ('room', 's'), ('credits', 'v'),
+]
+
+
+class StringTable:
+    """Interns strings into a list and hands out their indexes"""
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings = strings or []
+        self._index = {s: i for i, s in enumerate(self.strings)}
+
+    def ref(self, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        value = str(value)
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.strings.append(value)
+            self._index[value] = idx
+        return idx
+
+    def get(self, idx: Optional[int]) -> Optional[str]:
+        return None if idx is None else self.strings[idx]
+
+
+def _pack(record: Dict, fields, table: StringTable) -> List:
+    row = []
+    for name, kind in fields:
+        value = record.get(name)
+        if kind == 's':
+            row.append(table.ref(value))
+        elif kind == 'ls':
+            row.append([table.ref(v) for v in value or []])
+        else:
+            row.append(value)
+    return row
+
+
+def _unpack(row: List, fields, table: StringTable) -> Dict:
+    record = {}
+    for (name, kind), value in zip(fields, row):
+        if kind == 's':
+            record[name] = table.get(value)
+        elif kind == 'ls':
+            record[name] = [table.get(v) for v in value]
+        else:
+            record[name] = value
+    return record
+
+
+def _with_time_fields(section: Dict) -> Dict:
+    # The integer time fields are derived, so the file only stores the display strings
+    section.update(meeting_fields(section['days'], section['start_time'], section['end_time']) or {})
+    return section
+
+
+class CourseSnapshot:
+    """Course info, syllabus offerings and sections loaded from a snapshot file"""
+
+    def __init__(self, term: str, built_at: float, courses: Dict[str, Dict],
+                 syllabi: Dict[str, List[Dict]], sections: Dict[str, List[Dict]]):
+        self.term = term
+        self.built_at = built_at
+        self.courses = courses
+        self.syllabi = syllabi
+        self.sections = sections
+
+    def to_file(self, path: str) -> None:
+        table = StringTable()
+        payload = {
+            'format': SNAPSHOT_FORMAT,
+            'version': SNAPSHOT_VERSION,
+            'term': self.term,
+            'built_at': self.built_at,
+            'courses': [_pack(info, COURSE_FIELDS, table) for info in self.courses.values()],
+            'syllabi': {
+                code: [_pack(o, OFFERING_FIELDS, table) for o in offerings]
+                for code, offerings in self.syllabi.items()
+            },
+            'sections': {
+                code: [_pack(s, SECTION_FIELDS, table) for s in sections]
+                for code, sections in self.sections.items()
+            },
+        }
+        payload['strings'] = table.strings
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'CourseSnapshot':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+
+        if payload.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a course snapshot")
+        if payload.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {payload.get('version')} in {path}")
+
+        table = StringTable(payload['strings'])
+        courses = {}
+        for row in payload['courses']:
+            info = _unpack(row, COURSE_FIELDS, table)
+            courses[course_scraper.normalize_course_code(info['code'])] = info
+        syllabi = {
+            code: [_unpack(row, OFFERING_FIELDS, table) for row in rows]
+            for code, rows in payload['syllabi'].items()
+        }
+        for code, offerings in syllabi.items():
+            if code in courses:
+                courses[code]['offerings'] = offerings
+        # Answer lookups without the lab/combined suffix, as the live index does
+        for code, info in list(courses.items()):
+            if not code[-1].isdigit() and code[:-1] not in courses:
+                courses[code[:-1]] = info
+        sections = {
+            code: [_with_time_fields(_unpack(row, SECTION_FIELDS, table)) for row in rows]
+            for code, rows in payload['sections'].items()
+        }
+        return cls(payload['term'], payload['built_at'], courses, syllabi, sections)
+
+
+def requirement_codes() -> List[str]:
+    """Every course code referenced by the degree requirements"""
+    return list(dict.fromkeys(
+        code
+        for groups in requirement_catalog.groups.values()
+        for group in groups
+        for option in group.options
+        for code in option
+    ))
+
+
+def build_snapshot(term: str) -> CourseSnapshot:
+    """
+    Crawl the catalog, syllabus page and schedule API into a snapshot.
+
+    Raises:
+        SnapshotBuildError: a catalog page, the syllabus page or a course's
+            sections could not be downloaded; a snapshot missing them would be
+            served as complete
+    """
+    scraper = course_scraper.catalog_index.scraper
+
+    # 1. Every distinct catalog department page
+    catalog = {}
+    catalog_aliases = set()
+    failed = {}
+    for dept, url in scraper.catalog_urls.items():
+        failed.setdefault(url, []).append(dept)
+    for url in list(failed):
+        try:
+            page = course_scraper.catalog_index.page(url, raise_errors=True)
+        except Exception:
+            continue
+        del failed[url]
+        for code, info in page.items():
+            catalog_aliases.add(code)
+            # Skip the suffix-less aliases, they are rebuilt at load time
+            if info['code'] == code:
+                catalog.setdefault(code, info)
+
+    if failed:
+        missing = sorted(dept for depts in failed.values() for dept in depts)
+        raise SnapshotBuildError(f"Could not download catalog pages for departments: {', '.join(missing)}")
+
+    # 2. The CISE syllabus page
+    syllabi = syllabus_scraper.syllabus_index.offerings()
+    if not syllabi:
+        raise SnapshotBuildError("Could not download the CISE syllabus page")
+
+    # 3. Merge them the same way get_course_info does
+    courses = {}
+    for code, info in catalog.items():
+        info = dict(info)
+        offerings = syllabi.get(code)
+        if offerings:
+            if offerings[0].get('instructor'):
+                info['instructor'] = offerings[0]['instructor']
+            if offerings[0].get('syllabus_url'):
+                info['syllabus_url'] = offerings[0]['syllabus_url']
+        courses[code] = info
+    for code, offerings in syllabi.items():
+        if code in catalog_aliases or code in courses:
+            continue
+        courses[code] = {
+            'code': code,
+            'name': offerings[0].get('course_title') or f"Course {code}",
+            'credits': 3,
+            'description': "Course description available through UF catalog.",
+            'prerequisites': "",
+            'grading_scheme': "Letter Grade",
+            'instructor': offerings[0].get('instructor', 'TBD'),
+            'syllabus_url': offerings[0].get('syllabus_url'),
+        }
+
+    # 4. Schedule of Courses sections for the courses the app recommends, fetched concurrently.
+    # Straight from the API rather than through the cache, which turns errors into []
+    codes = [code for code in requirement_codes() if uf_api_service.COURSE_CODE_RE.match(code)]
+
+    def fetch(code):
+        try:
+            return code, uf_api_service._fetch_course_sections(code, term), None
+        except Exception as e:
+            return code, None, e
+
+    sections = {}
+    failed_sections = []
+    with ThreadPoolExecutor(max_workers=SNAPSHOT_SECTION_WORKERS) as executor:
+        for code, course_sections, error in executor.map(fetch, codes):
+            if error is not None:
+                print(f"Error fetching sections for {code} ({term}): {str(error)}")
+                failed_sections.append(code)
+            elif course_sections:
+                sections[code] = course_sections
+    if failed_sections:
+        raise SnapshotBuildError(f"Could not fetch sections for courses: {', '.join(failed_sections)}")
+
+    return CourseSnapshot(term, time.time(), courses, syllabi, sections)
+
+
+def install_snapshot(snapshot: CourseSnapshot) -> None:
+    """Serve course info and sections from the snapshot instead of scraping"""
+    course_scraper.use_snapshot(snapshot)
+    uf_api_service.use_snapshot(snapshot)
+    print(f"Loaded course snapshot for term {snapshot.term}: "
+          f"{len(snapshot.courses)} courses, {len(snapshot.sections)} courses with sections")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or inspect offline course data snapshots')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='crawl UF sources into a snapshot file')
+    build.add_argument('--term', default='2251', help='UF term code, e.g. 2251 for Spring 2025')
+    build.add_argument('--output', default='course_snapshot.json.gz', help='snapshot file to write')
+
+    info = subparsers.add_parser('info', help='print a summary of a snapshot file')
+    info.add_argument('path')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        try:
+            # Offline job, worth retrying slow sources
+            with http_client.background_requests():
+                snapshot = build_snapshot(args.term)
+        except SnapshotBuildError as e:
+            print(f"ERROR - {str(e)}, no snapshot written")
+            sys.exit(1)
+        snapshot.to_file(args.output)
+        print(f"Wrote {args.output}: {len(snapshot.courses)} courses, "
+              f"{len(snapshot.syllabi)} syllabus codes, {len(snapshot.sections)} courses with sections")
+    else:
+        snapshot = CourseSnapshot.from_file(args.path)
+        print(f"Term: {snapshot.term}")
+        print(f"Built: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot.built_at))}")
+        print(f"Courses: {len(snapshot.courses)}")
+        print(f"Syllabus codes: {len(snapshot.syllabi)}")
+        print(f"Courses with sections: {len(snapshot.sections)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Apply Alembic migrations at startup.
+
+Replaces db.create_all(), which never changes tables that already exist.
+Databases created before migrations were introduced (from schema.sql or
+create_all) are stamped at the initial revision first so only the newer
+migrations run against them. schema.sql and create_all already include the
+later columns and indexes, so every migration after 0001 has to skip
+changes that are already present. schema.sql records its own revision in
+alembic_version.
+
+Every web worker imports the app and so runs the upgrade, so it happens
+under a lock: a session advisory lock on PostgreSQL, a file lock in the
+system temp dir for anything else (the sqlite smoke tests). Workers
+that lose the race wait, then find nothing left to do.
+
+Run manually with:
+    alembic upgrade head
+"""
+import fcntl
+import os
+import tempfile
+from contextlib import contextmanager
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+INITIAL_REVISION = '0001'
+# Any constant works as long as every process uses the same one
+MIGRATION_LOCK_ID = 0x504C4147
+MIGRATION_LOCK_FILE = os.path.join(tempfile.gettempdir(), 'plan-a-gator-migrations.lock')
+
+
+def alembic_config(database_url):
+    config = Config(os.path.join(BACKEND_DIR, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(BACKEND_DIR, 'migrations'))
+    config.set_main_option('sqlalchemy.url', database_url.replace('%', '%%'))
+    # Keep the app's own logging setup
+    config.attributes['configure_logger'] = False
+    return config
+
+
+@contextmanager
+def migration_lock(engine):
+    """Hold a lock that only one process at a time can have for this database"""
+    if engine.dialect.name == 'postgresql':
+        # Held on its own connection, PostgreSQL drops it if the process dies
+        with engine.connect() as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:id)'), {'id': MIGRATION_LOCK_ID})
+            try:
+                yield
+            finally:
+                connection.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': MIGRATION_LOCK_ID})
+        return
+
+    # Only covers processes on this host, enough for sqlite
+    with open(MIGRATION_LOCK_FILE, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def upgrade_database(db):
+    """Bring the app's database up to the latest migration"""
+    engine = db.engine
+    config = alembic_config(engine.url.render_as_string(hide_password=False))
+
+    with migration_lock(engine):
+        # Checked under the lock, another worker may have just migrated
+        tables = inspect(engine).get_table_names()
+        if 'users' in tables and 'alembic_version' not in tables:
+            print(f"Existing database without migration history, stamping revision {INITIAL_REVISION}")
+            command.stamp(config, INITIAL_REVISION)
+
+        command.upgrade(config, 'head')
@@ -0,0 +1,169 @@
+"""
+Semester-by-semester degree plan generator.
+
+Builds a plan to graduation from the requirement catalog:
+1. Pick one option for every unsatisfied Core/GenEd requirement group
+   (the option with the shortest missing prerequisite chain) plus any
+   requested electives
+2. Pull in every missing prerequisite of the chosen courses
+3. List-schedule them into terms: each term takes the unlocked courses
+   with the longest chain of dependents first, up to the credit cap
+
+Critical-path-first list scheduling is what keeps the number of terms
+down; the plan reports a lower bound (longest chain vs. credits / cap) so
+callers can see when it is provably optimal. Plans are memoized per
+(college, completed set, cap, electives).
+"""
+import copy
+import math
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from eligibility import eligibility_engine
+from requirement_catalog import requirement_catalog, prereq_graph
+
+DEFAULT_MAX_CREDITS = 15
+PLANNED_CATEGORIES = ("Core", "GenEd")
+ELECTIVE_CATEGORY = "Elective/eligible"
+
+
+def course_credits(code: str) -> int:
+    """Credit estimate when the catalog has nothing better: labs are 1, lectures 3"""
+    return 1 if code.endswith("L") else 3
+
+
+def _missing_depth(code: str, completed: FrozenSet[str]) -> int:
+    return prereq_graph.semesters_remaining(code, completed)
+
+
+def _choose_courses(college: str, completed: FrozenSet[str], electives: int) -> List[str]:
+    """Courses that still have to be taken, in requirement order"""
+    chosen: List[str] = []
+    for category in PLANNED_CATEGORIES:
+        for group in requirement_catalog.category(college, category):
+            if group.is_satisfied(completed):
+                continue
+            # Cheapest option: shortest missing chain, then fewest missing prerequisites
+            best = min(
+                group.suggestions,
+                key=lambda code: (_missing_depth(code, completed), len(prereq_graph.missing_chain(code, completed)))
+            )
+            chosen.append(best)
+
+    if electives:
+        taken = eligibility_engine.mask(completed)
+        pool = eligibility_engine.to_codes(
+            college, ELECTIVE_CATEGORY, eligibility_engine.remaining_mask(college, ELECTIVE_CATEGORY, taken)
+        )
+        pool = [code for code in pool if code not in chosen]
+        # Electives reachable soonest first, requirement order breaks ties
+        pool.sort(key=lambda code: _missing_depth(code, completed))
+        chosen.extend(pool[:electives])
+
+    # Every missing prerequisite has to be planned as well
+    planned = dict.fromkeys(chosen)
+    for code in chosen:
+        for need in sorted(prereq_graph.missing_chain(code, completed)):
+            planned.setdefault(need)
+    return list(planned)
+
+
+def _schedule(courses: List[str], completed: FrozenSet[str], max_credits: int,
+              credits: Dict[str, int]) -> List[List[str]]:
+    """Critical-path-first list scheduling under a per-term credit cap"""
+    planned = set(courses)
+    needs = {code: (prereq_graph.direct_prereqs(code) - completed) & planned for code in courses}
+    dependents: Dict[str, List[str]] = {code: [] for code in courses}
+    for code, reqs in needs.items():
+        for req in reqs:
+            dependents[req].append(code)
+
+    # Height: longest chain of planned courses that still depends on this one
+    height: Dict[str, int] = {}
+    for code in sorted(courses, key=lambda c: -prereq_graph.position.get(c, -1)):
+        height[code] = 1 + max((height[d] for d in dependents[code] if d in height), default=0)
+    rank = {code: i for i, code in enumerate(courses)}
+    priority = lambda code: (-height[code], -len(dependents[code]), rank[code])
+
+    waiting = {code: len(reqs) for code, reqs in needs.items()}
+    ready = [code for code, count in waiting.items() if count == 0]
+    terms: List[List[str]] = []
+    while ready:
+        ready.sort(key=priority)
+        term, load, deferred = [], 0, []
+        for code in ready:
+            course_load = credits.get(code) or course_credits(code)
+            # Always place at least one course so oversize courses still get a term
+            if term and load + course_load > max_credits:
+                deferred.append(code)
+                continue
+            term.append(code)
+            load += course_load
+        terms.append(term)
+
+        ready = deferred
+        for code in term:
+            for dependent in dependents[code]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+    return terms
+
+
+@lru_cache(maxsize=512)
+def _plan(college: str, completed: FrozenSet[str], max_credits: int, electives: int,
+          credit_items: FrozenSet) -> Dict:
+    credits = dict(credit_items)
+    courses = _choose_courses(college, completed, electives)
+    terms = _schedule(courses, completed, max_credits, credits)
+
+    total_credits = sum(credits.get(code) or course_credits(code) for code in courses)
+    longest_chain = max((_missing_depth(code, completed) for code in courses), default=0)
+    lower_bound = max(longest_chain, math.ceil(total_credits / max_credits)) if courses else 0
+
+    return {
+        'college': college,
+        'terms': [
+            {
+                'term': i + 1,
+                'courses': term,
+                'credits': sum(credits.get(code) or course_credits(code) for code in term),
+            }
+            for i, term in enumerate(terms)
+        ],
+        'total_terms': len(terms),
+        'total_credits': total_credits,
+        'lower_bound_terms': lower_bound,
+        'optimal': len(terms) == lower_bound,
+    }
+
+
+def plan_degree(
+        college: str,
+        completed_codes: Iterable[str],
+        max_credits: int = DEFAULT_MAX_CREDITS,
+        electives: int = 0,
+        credits: Optional[Dict[str, int]] = None,
+    ) -> Dict:
+    """
+    Plan the remaining terms to graduation.
+
+    Args:
+        college: key in REQUIREMENTS, e.g. "ENG" or "CLAS"
+        completed_codes: course codes already taken
+        max_credits: credit cap per term
+        electives: number of Elective/eligible courses to include
+        credits: optional course code -> credits, overriding the estimate
+
+    Returns:
+        dict with the ordered terms, totals and the lower bound on terms
+    """
+    if max_credits <= 0:
+        raise ValueError("max_credits must be positive")
+    if electives < 0:
+        raise ValueError("electives must not be negative")
+    if not any(key[0] == college for key in requirement_catalog.groups):
+        raise ValueError(f"Unknown college: {college}")
+    completed = frozenset(code.replace(" ", "").upper() for code in completed_codes if code)
+    # Copy so callers can't modify the memoized plan
+    return copy.deepcopy(_plan(college, completed, max_credits, electives, frozenset((credits or {}).items())))
@@ -0,0 +1,119 @@
+"""
+Bitset eligibility engine for course recommendations.
+
+Every course code in the requirement catalog gets an integer id once at
+import, and each college/category list of requirement groups is compiled
+into bitmasks over those ids. A transcript becomes one Python int, so finding
+what is left in a category and which of those courses are unlocked is a
+handful of AND / NOT operations instead of rebuilding strings per request.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from requirement_catalog import RequirementCatalog, RequirementGroup, requirement_catalog
+
+
+class CompiledCategory:
+    """One college/category requirement list as bitmasks"""
+    __slots__ = ('single_mask', 'groups', 'order')
+
+    def __init__(self, single_mask: int, groups: List[Tuple[int, int]], order: List[int]):
+        # Courses that are required on their own
+        self.single_mask = single_mask
+        # OR groups: (mask of every code that satisfies the group, mask of the codes to suggest)
+        self.groups = groups
+        # Bit ids in requirement order, used to turn a mask back into an ordered list
+        self.order = order
+
+
+class EligibilityEngine:
+    def __init__(self, catalog: RequirementCatalog):
+        self.codes: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+        self.categories: Dict[Tuple[str, str], CompiledCategory] = {
+            key: self._compile(groups) for key, groups in catalog.groups.items()
+        }
+
+        # Prerequisite mask per course that has prerequisites
+        self.prereq_masks: List[Tuple[int, int]] = []
+        for code, needs in catalog.prereqs.items():
+            if needs:
+                self.prereq_masks.append((self.bit(code), self._bits(needs)))
+
+    def id(self, code: str) -> int:
+        idx = self.ids.get(code)
+        if idx is None:
+            idx = len(self.codes)
+            self.codes.append(code)
+            self.ids[code] = idx
+        return idx
+
+    def bit(self, code: str) -> int:
+        return 1 << self.id(code)
+
+    def _compile(self, requirement_groups: Iterable[RequirementGroup]) -> CompiledCategory:
+        single_mask = 0
+        groups = []
+        order = []
+        for group in requirement_groups:
+            if group.is_choice:
+                # OR group: satisfied by any code of any option, suggests the
+                # first code of each option
+                groups.append((self._bits(group.codes), self._bits(group.suggestions)))
+            else:
+                single_mask |= self.bit(group.suggestions[0])
+            order.extend(self.id(code) for code in group.suggestions)
+        return CompiledCategory(single_mask, groups, list(dict.fromkeys(order)))
+
+    def _bits(self, codes: Iterable[str]) -> int:
+        """Bitmask of codes, assigning ids to codes not seen yet"""
+        mask = 0
+        for code in codes:
+            mask |= self.bit(code)
+        return mask
+
+    def mask(self, codes: Iterable[str]) -> int:
+        """Bitmask of the known codes in codes (already normalized)"""
+        mask = 0
+        ids = self.ids
+        for code in codes:
+            idx = ids.get(code)
+            if idx is not None:
+                mask |= 1 << idx
+        return mask
+
+    def unmet_prereqs_mask(self, taken: int) -> int:
+        """Courses whose prerequisites are not all in taken"""
+        blocked = 0
+        for course_bit, needs in self.prereq_masks:
+            if needs & ~taken:
+                blocked |= course_bit
+        return blocked
+
+    def remaining_mask(self, college: str, category: str, taken: int) -> int:
+        """Courses still needed in a category (not taken, OR groups not yet satisfied)"""
+        compiled = self.categories.get((college, category))
+        if compiled is None:
+            return 0
+        remaining = compiled.single_mask & ~taken
+        for group_mask, suggest_mask in compiled.groups:
+            if not group_mask & taken:
+                remaining |= suggest_mask
+        return remaining
+
+    def eligible_mask(self, college: str, category: str, taken: int, blocked: Optional[int] = None) -> int:
+        """Courses still needed in a category whose prerequisites are met"""
+        if blocked is None:
+            blocked = self.unmet_prereqs_mask(taken)
+        return self.remaining_mask(college, category, taken) & ~blocked
+
+    def to_codes(self, college: str, category: str, mask: int) -> List[str]:
+        """Codes set in mask, in the category's requirement order"""
+        compiled = self.categories.get((college, category))
+        if compiled is None or not mask:
+            return []
+        return [self.codes[i] for i in compiled.order if mask >> i & 1]
+
+
+# Compiled once at import
+eligibility_engine = EligibilityEngine(requirement_catalog)
@@ -0,0 +1,140 @@
+"""
+Shared outbound HTTP layer for the scrapers and the UF API service.
+
+One requests.Session is reused by every module so TCP/TLS connections to
+the ufl.edu hosts stay alive between lookups. The session adds:
+1. Connection pooling with a per-host connection limit
+2. Retries with exponential backoff on connection errors and 429/5xx
+3. A default timeout on every call
+4. The per-host token bucket from rate_limiter.py
+
+Read timeouts are not retried on the request path: a hanging upstream
+would otherwise hold a request thread for (retries + 1) x HTTP_TIMEOUT.
+Background work (refreshes, prefetches, snapshot builds) runs inside
+background_requests(), which uses a second session that retries reads too.
+
+get_if_changed() adds conditional requests (ETag / Last-Modified) and a
+content hash so page refreshes can skip parsing when nothing changed.
+"""
+import contextvars
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import rate_limiter
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+# Keep-alive connections kept open per host
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', 4))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+# Read timeout retries for calls made while serving a request
+HTTP_READ_RETRIES = int(os.getenv('HTTP_READ_RETRIES', 0))
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))
+DEFAULT_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 10))
+
+
+def build_session(read_retries: Optional[int] = None) -> requests.Session:
+    """Create a pooled session with retries and the scraper User-Agent"""
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        read=read_retries,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST,
+        # Wait for a free connection instead of opening more than the limit
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
+_sessions: Dict[bool, requests.Session] = {}
+_session_lock = threading.Lock()
+_background = contextvars.ContextVar('http_background', default=False)
+
+
+@contextmanager
+def background_requests():
+    """Calls made inside this block are off the request path and retry read timeouts"""
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def get_session() -> requests.Session:
+    """The process-wide pooled session for the current context"""
+    background = _background.get()
+    session = _sessions.get(background)
+    if session is None:
+        with _session_lock:
+            session = _sessions.get(background)
+            if session is None:
+                session = _sessions[background] = build_session(None if background else HTTP_READ_RETRIES)
+    return session
+
+
+def get(url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+    """Rate-limited GET through the shared session"""
+    rate_limiter.wait(url)
+    return get_session().get(url, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+
+
+class PageValidators:
+    """Change-detection data remembered for one source URL"""
+    __slots__ = ('etag', 'last_modified', 'content_hash')
+
+    def __init__(self, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 content_hash: Optional[str] = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+
+
+def get_if_changed(url: str, validators: Optional[PageValidators] = None,
+                   timeout: Optional[float] = None, **kwargs) -> Tuple[Optional[requests.Response], PageValidators]:
+    """
+    Conditional GET against the validators from the previous fetch.
+
+    Returns (response, validators). response is None when the server answered
+    304 Not Modified or the body hashes the same as last time, so the caller
+    can keep its parsed copy.
+    """
+    headers = dict(kwargs.pop('headers', None) or {})
+    if validators:
+        if validators.etag:
+            headers['If-None-Match'] = validators.etag
+        if validators.last_modified:
+            headers['If-Modified-Since'] = validators.last_modified
+
+    response = get(url, timeout=timeout, headers=headers, **kwargs)
+    if response.status_code == 304 and validators:
+        return None, validators
+    response.raise_for_status()
+
+    new_validators = PageValidators(
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+        content_hash=hashlib.sha256(response.content).hexdigest(),
+    )
+    if validators and validators.content_hash == new_validators.content_hash:
+        return None, new_validators
+    return response, new_validators
@@ -0,0 +1,71 @@
+"""Initial schema (matches schema.sql before migrations were introduced)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Integer(), primary_key=True),
+        sa.Column('username', sa.String(50), nullable=False),
+        sa.Column('password_hash', sa.String(128), nullable=False),
+        sa.Column('email', sa.String(100), nullable=False, unique=True),
+        sa.Column('grade', sa.String(10)),
+        sa.Column('college', sa.String(100)),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'courses',
+        sa.Column('course_id', sa.Integer(), primary_key=True),
+        sa.Column('course_code', sa.String(20), nullable=False, unique=True),
+        sa.Column('course_name', sa.String(255)),
+        sa.Column('credits', sa.Integer()),
+        sa.Column('difficulty', sa.Integer()),
+        sa.Column('professor', sa.String(255)),
+    )
+    op.create_table(
+        'user_completed_courses',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('course_id', sa.Integer(), sa.ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('grade', sa.String(5)),
+        sa.Column('semester', sa.String(20)),
+        sa.Column('year', sa.Integer()),
+        sa.UniqueConstraint('user_id', 'course_id', name='uix_user_course'),
+    )
+    op.create_table(
+        'user_schedules',
+        sa.Column('schedule_id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'schedule_courses',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('schedule_id', sa.Integer(), sa.ForeignKey('user_schedules.schedule_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('course_id', sa.Integer(), sa.ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day_of_week', sa.String(10), nullable=False),
+        sa.Column('start_time', sa.String(10), nullable=False),
+        sa.Column('end_time', sa.String(10)),
+    )
+
+
+def downgrade():
+    op.drop_table('schedule_courses')
+    op.drop_table('user_schedules')
+    op.drop_table('user_completed_courses')
+    op.drop_table('courses')
+    op.drop_table('users')
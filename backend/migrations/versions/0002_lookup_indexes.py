@@ -0,0 +1,39 @@
+"""Indexes for the hot lookup columns used by app.py
+
+- user_schedules (user_id, schedule_id): schedules listed per user in id order
+- schedule_courses.schedule_id: slots loaded per schedule
+- schedule_courses.course_id, user_completed_courses.course_id: FK cascades
+- users.username
+
+user_completed_courses.user_id is already covered by uix_user_course.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_users_username', 'users', ['username']),
+    ('ix_user_completed_courses_course_id', 'user_completed_courses', ['course_id']),
+    ('ix_user_schedules_user_id_schedule_id', 'user_schedules', ['user_id', 'schedule_id']),
+    ('ix_schedule_courses_schedule_id', 'schedule_courses', ['schedule_id']),
+    ('ix_schedule_courses_course_id', 'schedule_courses', ['course_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,96 @@
+"""Integer minute-of-week times for saved schedule slots
+
+Adds schedule_courses.start_minute / end_minute (day * 1440 + minute of
+day) and fills them from the existing day_of_week / start_time / end_time
+strings. Slots whose strings can't be parsed are left NULL.
+
+Databases created from schema.sql or create_all already have the columns,
+so they are only added where missing. The time parsing is a frozen copy of
+time_model.py as of this revision, so later changes there can't change what
+this migration does.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+DAY_INDEX = {'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3, 'Friday': 4}
+MINUTES_PER_DAY = 24 * 60
+DEFAULT_MEETING_MINUTES = 50
+CLOCK_RE = re.compile(r'^\s*(\d{1,2}):?(\d{2})\s*([AaPp][Mm])?\s*$')
+
+
+def parse_clock(value):
+    """Minute of day for "0935", "14:30" or "9:35 AM", None if unparseable"""
+    match = CLOCK_RE.match(str(value or ''))
+    if not match:
+        return None
+    hour, minute, period = int(match.group(1)), int(match.group(2)), match.group(3)
+    if period:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if period.upper() == 'PM' else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def upgrade():
+    conn = op.get_bind()
+    existing = {column['name'] for column in sa.inspect(conn).get_columns('schedule_courses')}
+    for name in ('start_minute', 'end_minute'):
+        if name not in existing:
+            op.add_column('schedule_courses', sa.Column(name, sa.Integer(), nullable=True))
+
+    slots = sa.table(
+        'schedule_courses',
+        sa.column('id', sa.Integer), sa.column('day_of_week', sa.String), sa.column('start_time', sa.String),
+        sa.column('end_time', sa.String), sa.column('start_minute', sa.Integer), sa.column('end_minute', sa.Integer),
+    )
+    rows = conn.execute(
+        sa.select(slots.c.id, slots.c.day_of_week, slots.c.start_time, slots.c.end_time)
+        .where(slots.c.start_minute.is_(None))
+    ).all()
+
+    updates = []
+    for slot_id, day, start_time, end_time in rows:
+        day_index = DAY_INDEX.get(day)
+        start = parse_clock(start_time)
+        if day_index is None or start is None:
+            continue
+        end = parse_clock(end_time)
+        if end is None or end <= start:
+            end = start + DEFAULT_MEETING_MINUTES
+        updates.append({
+            'slot_id': slot_id,
+            'start_minute': day_index * MINUTES_PER_DAY + start,
+            'end_minute': day_index * MINUTES_PER_DAY + end,
+        })
+
+    stmt = (
+        slots.update()
+        .where(slots.c.id == sa.bindparam('slot_id'))
+        .values(start_minute=sa.bindparam('start_minute'), end_minute=sa.bindparam('end_minute'))
+    )
+    for i in range(0, len(updates), BATCH_SIZE):
+        conn.execute(stmt, updates[i:i + BATCH_SIZE])
+
+
+def downgrade():
+    # batch mode so SQLite can drop the columns too
+    with op.batch_alter_table('schedule_courses') as batch:
+        batch.drop_column('end_minute')
+        batch.drop_column('start_minute')
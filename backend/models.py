@@ -6,7 +6,7 @@ db = SQLAlchemy()
 class User(db.Model):
     __tablename__ = 'users'
     user_id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(50), nullable=False)
+    username = db.Column(db.String(50), nullable=False, index=True)
     password_hash = db.Column(db.String(128), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     grade = db.Column(db.String(10))
@@ -34,7 +34,7 @@ class UserCompletedCourse(db.Model):
     __tablename__ = 'user_completed_courses'
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False, index=True)
     grade = db.Column(db.String(5))
     semester = db.Column(db.String(20))
     year = db.Column(db.Integer)
@@ -55,15 +55,22 @@ class UserSchedule(db.Model):
     # Relationships
     user = db.relationship('User', back_populates='schedules')
     schedule_courses = db.relationship('ScheduleCourse', back_populates='schedule', cascade='all, delete-orphan')
+    
+    # Schedules are always listed per user in id order
+    __table_args__ = (db.Index('ix_user_schedules_user_id_schedule_id', 'user_id', 'schedule_id'),)
 
 class ScheduleCourse(db.Model):
     __tablename__ = 'schedule_courses'
     id = db.Column(db.Integer, primary_key=True)
-    schedule_id = db.Column(db.Integer, db.ForeignKey('user_schedules.schedule_id', ondelete='CASCADE'), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False)
+    schedule_id = db.Column(db.Integer, db.ForeignKey('user_schedules.schedule_id', ondelete='CASCADE'), nullable=False, index=True)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False, index=True)
     day_of_week = db.Column(db.String(10), nullable=False)
     start_time = db.Column(db.String(10), nullable=False)
     end_time = db.Column(db.String(10))
+    # Minute of week (see time_model.py), what slots are sorted and compared by;
+    # the string columns above are kept for display
+    start_minute = db.Column(db.Integer)
+    end_minute = db.Column(db.Integer)
     
     # Relationships
     schedule = db.relationship('UserSchedule', back_populates='schedule_courses')
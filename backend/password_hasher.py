@@ -0,0 +1,91 @@
+"""
+Password hashing on a dedicated, bounded pool.
+
+bcrypt is deliberately slow (tens to hundreds of milliseconds per hash at
+the default cost), so a burst of sign-ins used to hold every Flask worker.
+Hashes and checks now run on a pool of PASSWORD_HASH_WORKERS threads;
+bcrypt releases the GIL while it works, so the rest of the API keeps running
+alongside.
+
+The request thread still waits for its hash (up to PASSWORD_HASH_TIMEOUT),
+so the isolation comes from the admission limit: at most
+PASSWORD_HASH_MAX_PENDING requests are queued or hashing at once, and past
+that PasswordHasherBusy is raised right away. That limit is the most web
+threads auth can ever park, so keep it well below the server's thread
+count; the defaults (2 hashing, 2 waiting, 3 s) leave the rest free for
+course info and schedules.
+
+New hashes use BCRYPT_LOG_ROUNDS. A stored hash made with a different cost
+still verifies, and needs_rehash tells the caller to replace it on the next
+successful sign-in.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from flask_bcrypt import Bcrypt
+
+from bounded_pool import BoundedPool
+
+BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 4))
+PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 3))
+
+# Not bound to the app, every setting it would read from app.config is passed explicitly
+_bcrypt = Bcrypt()
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Too many password hashes are already queued"""
+
+
+_pool = BoundedPool(
+    lambda: ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash'),
+    max_pending=PASSWORD_HASH_MAX_PENDING,
+    timeout=PASSWORD_HASH_TIMEOUT,
+    busy=PasswordHasherBusy,
+    busy_message="Too many sign-ups and sign-ins at once, try again shortly",
+)
+
+
+def hash_password(password: str) -> str:
+    """
+    bcrypt hash of a password at BCRYPT_LOG_ROUNDS.
+
+    Raises:
+        ValueError: the password is empty or longer than bcrypt accepts
+        PasswordHasherBusy: PASSWORD_HASH_MAX_PENDING hashes are already in flight
+        concurrent.futures.TimeoutError: hashing took longer than PASSWORD_HASH_TIMEOUT
+    """
+    return _pool.run(_bcrypt.generate_password_hash, password, BCRYPT_LOG_ROUNDS).decode('utf-8')
+
+
+def check_password(pw_hash: str, password: str) -> bool:
+    """
+    True if the password matches the stored hash.
+
+    Raises:
+        PasswordHasherBusy: PASSWORD_HASH_MAX_PENDING hashes are already in flight
+        concurrent.futures.TimeoutError: the check took longer than PASSWORD_HASH_TIMEOUT
+    """
+    if not pw_hash or not password:
+        return False
+    try:
+        return _pool.run(_bcrypt.check_password_hash, pw_hash, password)
+    except ValueError:
+        # Malformed stored hash or a password bcrypt can't take
+        return False
+
+
+def hash_rounds(pw_hash: str) -> Optional[int]:
+    """Cost factor of a "$2b$12$..." hash, None if it isn't a bcrypt hash"""
+    parts = (pw_hash or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(pw_hash: str) -> bool:
+    """True if the hash was made with a cost other than BCRYPT_LOG_ROUNDS"""
+    return hash_rounds(pw_hash) != BCRYPT_LOG_ROUNDS
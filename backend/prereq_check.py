@@ -1,5 +1,5 @@
 from typing import List, Set, Dict
-from requirements import PREREQ_MAP
+from requirement_catalog import prereq_graph
 
 # fnction to format codes incase they have a space in between so its just all together
 def format_codes(codes: List[str]) -> List[str]:
@@ -23,16 +23,10 @@ def has_taken(user_codes: List[str]) -> List[str]:
 
 # returns true only if user has taken all prereqs for given course code
 # course_code is the course code checking
-# first want to format then look up prereqs then check prereqs have been met
+# prereqs are normalized once in requirement_catalog so this is just a set check
 def verify_prereq_code(user_codes_set: Set[str], course_code: str) -> bool:
     if not course_code:
         return False
     
     target = course_code.replace(" ", "").upper()
-    needs_prereq = [i.upper() for i in PREREQ_MAP.get(target, [])]
-    if not needs_prereq:
-        return True
-    for requirement in needs_prereq:
-        if requirement not in user_codes_set:
-            return False
-    return True
+    return prereq_graph.is_eligible(target, user_codes_set)
@@ -0,0 +1,117 @@
+"""
+Prerequisite graph built once from PREREQ_MAP.
+
+The map is normalized into an adjacency table, and the transitive
+closure (both directions), longest prerequisite chain and a topological
+order are precomputed. A cycle raises PrereqCycleError when the graph is built.
+The shared instance is built by requirement_catalog.py at import.
+
+Per-course queries ("eligible now", "blocked by", "minimum semesters
+remaining") then only touch the precomputed sets for that course.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+def _normalize(code: str) -> str:
+    return code.replace(" ", "").upper()
+
+
+class PrereqCycleError(ValueError):
+    """PREREQ_MAP contains a prerequisite cycle"""
+
+
+class PrereqGraph:
+    def __init__(self, prereq_map: Dict[str, Iterable[str]]):
+        # Direct prerequisites, normalized
+        self.prereqs: Dict[str, FrozenSet[str]] = {}
+        for course, needs in prereq_map.items():
+            code = _normalize(course)
+            self.prereqs[code] = self.prereqs.get(code, frozenset()) | frozenset(_normalize(n) for n in needs)
+        for needs in list(self.prereqs.values()):
+            for need in needs:
+                self.prereqs.setdefault(need, frozenset())
+
+        # Reverse edges: course -> courses that list it as a direct prerequisite
+        self.unlocks: Dict[str, FrozenSet[str]] = {code: frozenset() for code in self.prereqs}
+        for code, needs in self.prereqs.items():
+            for need in needs:
+                self.unlocks[need] = self.unlocks[need] | {code}
+
+        self.order: List[str] = self._topological_order()
+        self.position: Dict[str, int] = {code: i for i, code in enumerate(self.order)}
+
+        # Transitive closure and longest chain, filled in dependency order
+        self.closure: Dict[str, FrozenSet[str]] = {}
+        self.depth: Dict[str, int] = {}
+        for code in self.order:
+            needs = self.prereqs[code]
+            closure = set(needs)
+            for need in needs:
+                closure |= self.closure[need]
+            self.closure[code] = frozenset(closure)
+            self.depth[code] = 1 + max((self.depth[need] for need in needs), default=0)
+
+        # Reverse closure: every course that needs code, directly or transitively
+        self.descendants: Dict[str, FrozenSet[str]] = {}
+        for code in reversed(self.order):
+            unlocked = set(self.unlocks[code])
+            for course in self.unlocks[code]:
+                unlocked |= self.descendants[course]
+            self.descendants[code] = frozenset(unlocked)
+
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm, prerequisites before the courses that need them"""
+        remaining = {code: len(needs) for code, needs in self.prereqs.items()}
+        ready = sorted(code for code, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            code = ready.pop()
+            order.append(code)
+            for unlocked in sorted(self.unlocks[code], reverse=True):
+                remaining[unlocked] -= 1
+                if remaining[unlocked] == 0:
+                    ready.append(unlocked)
+
+        if len(order) != len(self.prereqs):
+            stuck = sorted(code for code, count in remaining.items() if count > 0)
+            raise PrereqCycleError(f"Prerequisite cycle among: {', '.join(stuck)}")
+        return order
+
+    def direct_prereqs(self, code: str) -> FrozenSet[str]:
+        return self.prereqs.get(code, frozenset())
+
+    def all_prereqs(self, code: str) -> FrozenSet[str]:
+        """Every course that has to be taken before code, directly or transitively"""
+        return self.closure.get(code, frozenset())
+
+    def all_unlocks(self, code: str) -> FrozenSet[str]:
+        """Every course that needs code before it can be taken, directly or transitively"""
+        return self.descendants.get(code, frozenset())
+
+    def is_eligible(self, code: str, completed: Set[str]) -> bool:
+        """True if every direct prerequisite of code has been completed"""
+        return self.prereqs.get(code, frozenset()) <= completed
+
+    def blocked_by(self, code: str, completed: Set[str]) -> FrozenSet[str]:
+        """Direct prerequisites of code that are still missing"""
+        return self.prereqs.get(code, frozenset()) - completed
+
+    def missing_chain(self, code: str, completed: Set[str]) -> FrozenSet[str]:
+        """Every prerequisite (transitively) of code that is still missing"""
+        return self.closure.get(code, frozenset()) - completed
+
+    def semesters_remaining(self, code: str, completed: Set[str]) -> int:
+        """
+        Minimum number of semesters until code is completed, taking one link
+        of the prerequisite chain per semester. 0 if it is already completed.
+        """
+        if code in completed:
+            return 0
+        if not self.missing_chain(code, completed):
+            return 1
+        # Longest chain through the missing courses only, walked in topological order
+        missing = self.missing_chain(code, completed) | {code}
+        depth: Dict[str, int] = {}
+        for course in sorted(missing, key=self.position.__getitem__):
+            depth[course] = 1 + max((depth[n] for n in self.prereqs[course] if n in depth), default=0)
+        return depth[code]
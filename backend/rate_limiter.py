@@ -0,0 +1,75 @@
+"""
+Per-host rate limiting for outbound scraping requests.
+
+Each host (catalog.ufl.edu, cise.ufl.edu, one.ufl.edu) gets a token bucket
+shared by every thread in the process. Only code that is about to make an
+HTTP call waits on it, so cache hits never sleep.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Sustained requests per second and burst size allowed against one host
+DEFAULT_RATE = float(os.getenv('OUTBOUND_RATE_PER_HOST', 2.0))
+DEFAULT_BURST = int(os.getenv('OUTBOUND_BURST_PER_HOST', 2))
+
+
+class TokenBucket:
+    """Thread-safe token bucket"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller has to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            # Token is borrowed from the future, wait until it has been refilled
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available, returns the time spent waiting"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    """One token bucket per outbound host"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 overrides: Optional[Dict[str, float]] = None):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.overrides.get(host, self.rate), self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def wait(self, url: str) -> float:
+        """Wait for permission to call url's host"""
+        host = urlparse(url).netloc.lower()
+        return self.bucket(host).acquire()
+
+
+# Shared by all scrapers in this process
+rate_limiter = HostRateLimiter()
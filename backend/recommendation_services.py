@@ -1,7 +1,23 @@
-from typing import List, Dict, Union
-from requirements import REQUIREMENTS
-from prereq_check import has_taken, verify_prereq_code
+
+from functools import lru_cache
+from typing import FrozenSet, List, Dict, Optional, Union
+from eligibility import eligibility_engine
+from requirement_catalog import requirement_catalog, prereq_graph
+import hashlib
+import os
 import random
+import zlib
+
+# "ranked" is deterministic and cacheable, "random" is the old random.sample behaviour
+RECOMMENDATION_MODE = os.getenv('RECOMMENDATION_MODE', 'ranked').lower()
+RECOMMENDATION_CACHE_SIZE = int(os.getenv('RECOMMENDATION_CACHE_SIZE', 1024))
+CATEGORIES = ["Core", "GenEd", "Elective/eligible"]
+
+# Changes whenever requirements.py changes, so ETags from an old catalog stop matching
+CATALOG_DIGEST = hashlib.sha1(repr((
+    sorted((key, [group.options for group in groups]) for key, groups in requirement_catalog.groups.items()),
+    sorted((code, sorted(needs)) for code, needs in requirement_catalog.prereqs.items()),
+)).encode()).hexdigest()[:16]
 
 '''
 returns all courses in a given category that user hasnt taken yet
@@ -9,62 +25,58 @@ handles single courses and choice like if u can take either ENC 2256 or ENC 3246
 '''
 
 # get all courses for college and category
+# requirement lists are compiled to bitmasks once in eligibility.py
 def courses_eligible(user_codes_set, college: str, category: str) -> List[str]:
-    print(f"\nDEBUG: courses_eligible")
-    print(f"College: {college}")
-    print(f"Category: {category}")
-    print(f"User completed courses: {user_codes_set}")
-
-    records = REQUIREMENTS.get(college, {}).get(category, [])
-    print(f"All possible courses from REQUIREMENTS: {records}")
-
-    if not records:
+    taken = eligibility_engine.mask(user_codes_set)
+    remaining = eligibility_engine.remaining_mask(college, category, taken)
+    unique_codes = eligibility_engine.to_codes(college, category, remaining)
+    if (college, category) not in eligibility_engine.categories:
         print(f"WARNING: No courses found for {college} - {category}")
-        return []
-
-    remaining: List[str] = []
-
-    for course in records:
-        # --- OR GROUP ---
-        if isinstance(course, list):
-            print(f"Checking OR group: {course}")
-
-            # If user has taken ANY course in this group → skip
-            if any(opt.replace(" ", "").upper() in user_codes_set for opt in course):
-                print(f"✓ Satisfied OR group: {course}")
-                continue
-
-            # Otherwise add all options (or one default option)
-            added_opts = []
-            for opt in course:
-                if "|" in opt:  # handle combined like "PHY2048|PHY2048L"
-                    parts = [p.replace(" ", "").upper() for p in opt.split("|")]
-                    # Check if any part already taken
-                    if any(p in user_codes_set for p in parts):
-                        print(f"✓ Satisfied compound OR option: {opt}")
-                        break
-                    remaining.append(parts[0])  # suggest one by default
-                    added_opts.append(parts[0])
-                else:
-                    code = opt.replace(" ", "").upper()
-                    remaining.append(code)
-                    added_opts.append(code)
-            print(f"Added OR options: {added_opts}")
-
-        # --- SINGLE COURSE ---
-        else:
-            code = course.replace(" ", "").upper()
-            print(f"Checking single course: {code}")
-            if code not in user_codes_set:
-                remaining.append(code)
-                print(f"Added course: {code}")
-
-    # Remove duplicates while preserving order
-    unique_codes = list(dict.fromkeys(remaining))
-    print(f"Final available courses: {unique_codes}")
     return unique_codes
 
 
+'''
+ranking: courses that unlock the most of what is still left downstream in the
+prereq graph come first, then courses that count towards the most unsatisfied
+requirement groups. ties keep requirement order, or a seeded shuffle if a seed
+is given (same seed, same order)
+'''
+
+def rank_courses(pool: List[str], college: str, user_codes: FrozenSet[str], seed: Optional[int] = None) -> List[str]:
+    def score(item):
+        position, code = item
+        unlocks = len(prereq_graph.all_unlocks(code) - user_codes)
+        coverage = sum(
+            1 for group in requirement_catalog.groups_satisfied_by(code)
+            if group.college == college and not group.is_satisfied(user_codes)
+        )
+        # crc32 rather than hash() so the order is the same in every process
+        tiebreak = position if seed is None else zlib.crc32(f"{seed}:{code}".encode())
+        return (-unlocks, -coverage, tiebreak)
+
+    return [code for _, code in sorted(enumerate(pool), key=score)]
+
+
+def recommendation_etag(
+        college: str,
+        transcipt_codes: List[str],
+        category: str | None = None,
+        per_category_limit: int = 10,
+        category_limit: int = 4,
+        seed: int | None = None,
+    ) -> Optional[str]:
+    """ETag for a recommend_courses call, None when results are random"""
+    if RECOMMENDATION_MODE == 'random':
+        return None
+    user_codes = sorted(_normalize_codes(transcipt_codes))
+    key = repr((CATALOG_DIGEST, college, user_codes, category, per_category_limit, category_limit, seed))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _normalize_codes(transcipt_codes: List[str]) -> FrozenSet[str]:
+    return frozenset(code.replace(" ", "").strip().upper() for code in transcipt_codes if code.strip())
+
+
 '''
 recommendation service, first checks if category is provided
 if category is provided then returns up to 4 recs in that category
@@ -72,51 +84,76 @@ if category not specified then returns a dict w 2 recs from each category
 '''
 
 def recommend_courses(
-        college: str, 
-        transcipt_codes: List[str], 
-        category: str | None = None, 
-        per_category_limit: int = 10, 
+        college: str,
+        transcipt_codes: List[str],
+        category: str | None = None,
+        per_category_limit: int = 10,
         category_limit: int = 4,
+        seed: int | None = None,
     ) -> Union[List[str], Dict[str, List[str]]]:
-    
+
     # Normalize and validate input
     if not college or not transcipt_codes:
         print("Warning: Missing college or transcript codes")
         return {} if category is None else []
 
     # Normalize transcript codes to uppercase
-    user_codes = set(code.replace(" ", "").strip().upper() for code in transcipt_codes if code.strip())
-    print(f"User completed courses: {user_codes}")
-
-    # If specific category requested
-    def random_choices(category_name: str, max_pick: int) -> List[str]:
-        # everything that hasnt been taken
-        pool = courses_eligible(user_codes, college, category_name)
-        pool = [code for code in pool if verify_prereq_code(user_codes, code)]
+    user_codes = _normalize_codes(transcipt_codes)
+
+    if RECOMMENDATION_MODE == 'random':
+        return _recommend(college, user_codes, category, per_category_limit, category_limit, None, random_pick=True)
+
+    # Memoized, hand out copies so callers can't change the cached result
+    result = _ranked_recommendations(college, user_codes, category, per_category_limit, category_limit, seed)
+    if category:
+        return list(result)
+    return {category_name: list(picks) for category_name, picks in result}
+
+
+@lru_cache(maxsize=RECOMMENDATION_CACHE_SIZE)
+def _ranked_recommendations(college, user_codes, category, per_category_limit, category_limit, seed):
+    result = _recommend(college, user_codes, category, per_category_limit, category_limit, seed, random_pick=False)
+    if category:
+        return tuple(result)
+    return tuple((category_name, tuple(picks)) for category_name, picks in result.items())
+
+
+def _recommend(college, user_codes, category, per_category_limit, category_limit, seed, random_pick):
+    print(f"User completed courses: {set(user_codes)}")
+
+    # One bitmask for the transcript, prereq check shared by every category
+    taken = eligibility_engine.mask(user_codes)
+    blocked = eligibility_engine.unmet_prereqs_mask(taken)
+
+    def choices(category_name: str, max_pick: int) -> List[str]:
+        # everything that hasnt been taken and whose prereqs are met
+        pool = eligibility_engine.to_codes(
+            college, category_name,
+            eligibility_engine.eligible_mask(college, category_name, taken, blocked)
+        )
         print(f"POOL FOR {category_name}: {pool}")
         if not pool:
             return []
         pick_count = min(max_pick, len(pool))
-        # random.seed()
-        picks = random.sample(pool, pick_count)
+        if random_pick:
+            picks = random.sample(pool, pick_count)
+        else:
+            picks = rank_courses(pool, college, user_codes, seed)[:pick_count]
         print(f"PICKS FOR {category_name}: {picks}")
         return picks
-    
+
     if category:
-        pool = courses_eligible(user_codes, college, category)
-        if not pool:
+        if not eligibility_engine.remaining_mask(college, category, taken):
             print(f"User already fulfilled {category} requirements - No recommendation")
             return[]
-        return random_choices(category, category_limit)
-    
+        return choices(category, category_limit)
+
     result: Dict[str, List[str]] = {}
-    for category_name in ["Core", "GenEd", "Elective/eligible"]:
-        pool = courses_eligible(user_codes, college, category_name)
-        print(f"Checking CATEGORY {category_name} -> AVAILABLE COUNT: {len(pool)}")
-        if not pool:
+    for category_name in CATEGORIES:
+        if not eligibility_engine.remaining_mask(college, category_name, taken):
             print(f"User already fulfilled {category_name} requirements - skipping.")
             result[category_name] = []
             continue
-        result[category_name] = random_choices(category_name, per_category_limit)
+        result[category_name] = choices(category_name, per_category_limit)
 
-    return result
\ No newline at end of file
+    return result
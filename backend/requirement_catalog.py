@@ -0,0 +1,125 @@
+"""
+REQUIREMENTS and PREREQ_MAP compiled into a validated in-memory catalog.
+
+requirements.py mixes plain course strings, OR-lists and "A|B" compound
+options. This module interprets those shapes exactly once at import and
+produces immutable RequirementGroup objects with normalized codes, plus
+reverse indexes:
+- satisfies:   course code -> the requirement groups it counts towards
+- required_by: course code -> the courses that list it as a prerequisite
+
+Malformed course codes and prerequisite cycles raise at import. The
+prerequisite graph, the eligibility engine and the recommendation service
+are all built from this catalog rather than from the raw dicts.
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, Tuple
+
+from prereq_graph import PrereqGraph
+from requirements import REQUIREMENTS, PREREQ_MAP
+
+COURSE_CODE_RE = re.compile(r'^[A-Z]{3}\d{4}[A-Z]?$')
+
+
+class RequirementCatalogError(ValueError):
+    """requirements.py contains data the catalog cannot compile"""
+
+
+def normalize_code(code: str) -> str:
+    normalized = code.replace(" ", "").upper()
+    if not COURSE_CODE_RE.match(normalized):
+        raise RequirementCatalogError(f"Malformed course code in requirements.py: {code!r}")
+    return normalized
+
+
+class RequirementGroup:
+    """
+    One line of a college/category requirement list.
+
+    options holds the alternatives that satisfy the group; each option is a
+    tuple of codes (more than one for compound "A|B" entries, any of which
+    counts). A plain course string is a group with a single option.
+    """
+    __slots__ = ('college', 'category', 'options', 'codes', 'suggestions')
+
+    def __init__(self, college: str, category: str, options: Tuple[Tuple[str, ...], ...]):
+        object.__setattr__(self, 'college', college)
+        object.__setattr__(self, 'category', category)
+        object.__setattr__(self, 'options', options)
+        # Every code that satisfies the group
+        object.__setattr__(self, 'codes', frozenset(code for option in options for code in option))
+        # The code recommended for each option
+        object.__setattr__(self, 'suggestions', tuple(option[0] for option in options))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RequirementGroup is immutable")
+
+    @property
+    def is_choice(self) -> bool:
+        return len(self.options) > 1
+
+    def is_satisfied(self, completed: Iterable[str]) -> bool:
+        return not self.codes.isdisjoint(completed)
+
+    def __repr__(self):
+        return f"RequirementGroup({self.college!r}, {self.category!r}, {self.options!r})"
+
+
+class RequirementCatalog:
+    __slots__ = ('groups', 'prereqs', 'satisfies', 'required_by', 'codes', 'graph')
+
+    def __init__(self, requirements: Dict, prereq_map: Dict):
+        # (college, category) -> requirement groups in requirements.py order
+        self.groups: Dict[Tuple[str, str], Tuple[RequirementGroup, ...]] = {}
+        satisfies: Dict[str, list] = {}
+        for college, categories in requirements.items():
+            for category, records in categories.items():
+                groups = []
+                for record in records:
+                    options = record if isinstance(record, list) else [record]
+                    group = RequirementGroup(college, category, tuple(
+                        tuple(normalize_code(part) for part in option.split("|")) for option in options
+                    ))
+                    groups.append(group)
+                    for code in group.codes:
+                        satisfies.setdefault(code, []).append(group)
+                self.groups[(college, category)] = tuple(groups)
+        self.satisfies: Dict[str, Tuple[RequirementGroup, ...]] = {
+            code: tuple(groups) for code, groups in satisfies.items()
+        }
+
+        self.prereqs: Dict[str, FrozenSet[str]] = {}
+        for course, needs in prereq_map.items():
+            self.prereqs[normalize_code(course)] = frozenset(normalize_code(need) for need in needs)
+
+        required_by: Dict[str, set] = {}
+        for course, needs in self.prereqs.items():
+            for need in needs:
+                required_by.setdefault(need, set()).add(course)
+        self.required_by: Dict[str, FrozenSet[str]] = {
+            code: frozenset(courses) for code, courses in required_by.items()
+        }
+
+        self.codes: FrozenSet[str] = frozenset(self.satisfies) | frozenset(self.prereqs) | frozenset(self.required_by)
+
+        # Prerequisites no requirement list mentions can never be recommended
+        unknown = sorted(frozenset(self.required_by) - frozenset(self.satisfies))
+        if unknown:
+            print(f"WARNING: prerequisites not in any requirement list: {', '.join(unknown)}")
+
+        # Raises PrereqCycleError on a cycle
+        self.graph = PrereqGraph(self.prereqs)
+
+    def category(self, college: str, category: str) -> Tuple[RequirementGroup, ...]:
+        return self.groups.get((college, category), ())
+
+    def groups_satisfied_by(self, code: str) -> Tuple[RequirementGroup, ...]:
+        return self.satisfies.get(code, ())
+
+    def courses_requiring(self, code: str) -> FrozenSet[str]:
+        return self.required_by.get(code, frozenset())
+
+
+# Compiled and validated once at import
+requirement_catalog = RequirementCatalog(REQUIREMENTS, PREREQ_MAP)
+prereq_graph = requirement_catalog.graph
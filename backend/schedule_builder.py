@@ -0,0 +1,307 @@
+"""
+Conflict-free schedule builder over UF sections.
+
+Every section becomes a weekly time bitmask (one bit per 5 minutes of a
+Monday-Friday week). Sections of a course that meet at exactly the same
+times are merged into one option, since they are interchangeable for
+conflicts and ranking. The search is a backtracking branch and bound:
+1. Pick the course with the fewest options that still fit (MRV)
+2. Drop every option of the remaining courses that overlaps the one just
+   placed (forward checking, one AND per course with precomputed
+   compatibility bitsets); an empty course means backtrack
+3. Prune partial schedules whose lower bound already reaches the k-th
+   best complete schedule: days on campus and early starts only grow,
+   and idle time no remaining option can fill stays idle
+
+Complete schedules are scored (lower is better) by idle minutes between
+classes, days on campus and how early the days start, and the best k are
+returned. Options are tried cheapest first, so the search finds good
+schedules early; once SCHEDULE_SEARCH_BUDGET runs out it returns the best
+found so far and flags the result as truncated.
+"""
+import heapq
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from time_model import MINUTES_PER_DAY, WEEKDAYS, day_indexes, format_clock, section_fields
+from uf_api_service import prefetch_sections
+
+# Finer than UF periods so idle time between classes can be measured
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+
+# Passing time between consecutive UF periods, not counted as a gap
+PASSING_MINUTES = 15
+# Classes before this minute of the day count against a schedule
+PREFERRED_START = 10 * 60
+
+GAP_WEIGHT = 1          # per idle minute
+DAY_WEIGHT = 120        # per day on campus
+EARLY_WEIGHT = 2        # per minute before PREFERRED_START, per day
+
+# The search returns the best schedules found so far once this runs out
+SEARCH_BUDGET_SECONDS = float(os.getenv('SCHEDULE_SEARCH_BUDGET', 0.7))
+
+
+class SectionOption:
+    """Sections of one course that meet at identical times"""
+    __slots__ = ('course_code', 'sections', 'mask', 'busy', 'day_bits')
+
+    def __init__(self, course_code: str, intervals: Tuple[Tuple[int, int, int], ...]):
+        self.course_code = course_code
+        self.sections: List[Dict] = []
+        self.mask = time_mask(intervals)
+        # Class time plus the passing time after it, used to measure gaps
+        self.busy = time_mask((day, start, end + PASSING_MINUTES) for day, start, end in intervals)
+        self.day_bits = 0
+        for day, _, _ in intervals:
+            self.day_bits |= 1 << day
+
+
+def section_times(section: Dict) -> Optional[Tuple[Tuple[int, int, int], ...]]:
+    """(day index, start minute, end minute) for each meeting day, None without usable times"""
+    times = section_fields(section)
+    if times is None:
+        return None
+    return tuple((day, times['start_minute'], times['end_minute']) for day in day_indexes(times['day_mask']))
+
+
+def time_mask(intervals: Iterable[Tuple[int, int, int]]) -> int:
+    mask = 0
+    for day, start, end in intervals:
+        first = day * SLOTS_PER_DAY + start // SLOT_MINUTES
+        last = day * SLOTS_PER_DAY + min(SLOTS_PER_DAY, (end + SLOT_MINUTES - 1) // SLOT_MINUTES)
+        mask |= ((1 << (last - first)) - 1) << first
+    return mask
+
+
+def compile_options(course_code: str, sections: List[Dict]) -> List[SectionOption]:
+    """Group a course's sections by meeting times"""
+    options: Dict[Tuple, SectionOption] = {}
+    for section in sections:
+        intervals = section_times(section)
+        if intervals is None:
+            continue
+        option = options.get(intervals)
+        if option is None:
+            option = options[intervals] = SectionOption(course_code, intervals)
+        option.sections.append(section)
+    return list(options.values())
+
+
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+
+def measure(occupied: int, busy: int, fillable: int = 0, forced_days: int = 0) -> Tuple[int, int, int, Optional[int]]:
+    """
+    Score a week from its masks: (score, idle minutes, days on campus, earliest start minute).
+
+    Idle minutes are slots between a day's first and last class that are
+    neither class nor passing time. With fillable (busy mask of every option
+    a remaining course could still take) and forced_days (days the remaining
+    courses meet on no matter which option), the result is a lower bound for
+    every completion of a partial schedule: idle slots no remaining course
+    can reach stay idle, and days and early starts only grow.
+    """
+    idle_slots = 0
+    day_bits = forced_days
+    early = 0
+    earliest = None
+    for day in range(len(WEEKDAYS)):
+        shift = day * SLOTS_PER_DAY
+        classes = occupied >> shift & DAY_MASK
+        if not classes:
+            continue
+        day_bits |= 1 << day
+        first = (classes & -classes).bit_length() - 1
+        start = first * SLOT_MINUTES
+        if start < PREFERRED_START:
+            early += PREFERRED_START - start
+        if earliest is None or start < earliest:
+            earliest = start
+        day_busy = busy >> shift & DAY_MASK
+        span = ((1 << day_busy.bit_length()) - 1) & ~((1 << first) - 1)
+        idle_slots += bin(span & ~day_busy & ~(fillable >> shift & DAY_MASK)).count('1')
+    idle_minutes = idle_slots * SLOT_MINUTES
+    days = bin(day_bits).count('1')
+    return idle_minutes * GAP_WEIGHT + days * DAY_WEIGHT + early * EARLY_WEIGHT, idle_minutes, days, earliest
+
+
+def score_schedule(options: List[SectionOption]) -> Dict:
+    occupied = busy = 0
+    for option in options:
+        occupied |= option.mask
+        busy |= option.busy
+    score, idle_minutes, days, earliest = measure(occupied, busy)
+    return {
+        'score': score,
+        'gap_minutes': idle_minutes,
+        'days_on_campus': days,
+        'earliest_start': format_clock(earliest) if earliest is not None else None,
+    }
+
+
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def search(courses: Dict[str, List[SectionOption]], k: int = 5,
+           budget: float = SEARCH_BUDGET_SECONDS) -> Tuple[List[Tuple[int, List[SectionOption]]], int, bool]:
+    """
+    Best k conflict-free combinations, one option per course.
+
+    Returns:
+        (list of (score, options) best first, nodes explored, True if the
+        time budget ran out before the search finished)
+    """
+    deadline = time.perf_counter() + budget
+    options = list(courses.values())
+    n = len(options)
+
+    # compatible[i][j][other] = bitset of the other course's options that don't overlap option j of course i
+    compatible = [
+        [
+            [
+                sum(1 << m for m, theirs in enumerate(options[other]) if not theirs.mask & mine.mask)
+                for other in range(n)
+            ]
+            for mine in options[i]
+        ]
+        for i in range(n)
+    ]
+
+    # (course, live option bitset) -> (busy mask of the live options, days all of them meet on)
+    reach_memo: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def reach(i: int, live: int) -> Tuple[int, int]:
+        found = reach_memo.get((i, live))
+        if found is None:
+            fillable, forced = 0, 0b11111
+            for j in _bits(live):
+                fillable |= options[i][j].busy
+                forced &= options[i][j].day_bits
+            found = reach_memo[(i, live)] = (fillable, forced)
+        return found
+
+    best: List[Tuple[int, int, List[SectionOption]]] = []   # max-heap on score via negation
+    counter = 0
+    nodes = 0
+    truncated = False
+
+    def extend(alive: Dict[int, int], chosen: List[SectionOption], occupied: int, busy: int):
+        nonlocal counter, nodes, truncated
+        nodes += 1
+        if not nodes & 0xFF and time.perf_counter() > deadline:
+            truncated = True
+            return
+        limit = -best[0][0] if len(best) >= k else float('inf')
+
+        # Most constrained course first
+        i = min(alive, key=lambda c: bin(alive[c]).count('1'))
+        rest = [(c, live) for c, live in alive.items() if c != i]
+
+        candidates = []
+        for j in _bits(alive[i]):
+            option = options[i][j]
+            new_occupied = occupied | option.mask
+            new_busy = busy | option.busy
+            # Forward checking: keep only options that still fit
+            pruned = {}
+            fillable = forced = 0
+            for c, live in rest:
+                fitting = live & compatible[i][j][c]
+                if not fitting:
+                    break
+                pruned[c] = fitting
+                course_fillable, course_forced = reach(c, fitting)
+                fillable |= course_fillable
+                forced |= course_forced
+            else:
+                estimate = measure(new_occupied, new_busy, fillable, forced)[0]
+                if estimate < limit:
+                    candidates.append((estimate, j, pruned, new_occupied, new_busy))
+        # Cheapest first, so good schedules are found early and the bound tightens
+        candidates.sort(key=lambda item: item[:2])
+
+        for estimate, j, pruned, new_occupied, new_busy in candidates:
+            if len(best) >= k and estimate >= -best[0][0]:
+                break
+            chosen.append(options[i][j])
+            if pruned:
+                extend(pruned, chosen, new_occupied, new_busy)
+            else:
+                # estimate is exact once every course is placed
+                counter += 1
+                entry = (-estimate, -counter, list(chosen))
+                if len(best) >= k:
+                    heapq.heapreplace(best, entry)
+                else:
+                    heapq.heappush(best, entry)
+            chosen.pop()
+            if truncated:
+                return
+
+    if n:
+        extend({i: (1 << len(options[i])) - 1 for i in range(n)}, [], 0, 0)
+
+    ranked = sorted(best, key=lambda entry: (-entry[0], -entry[1]))
+    return [(-score, chosen) for score, _, chosen in ranked], nodes, truncated
+
+
+def build_schedules(course_codes: List[str], term: str = "2251", k: int = 5,
+                    sections: Optional[Dict[str, List[Dict]]] = None,
+                    budget: float = SEARCH_BUDGET_SECONDS) -> Dict:
+    """
+    Build the best k conflict-free schedules for a set of courses.
+
+    Args:
+        course_codes: courses to take together
+        term: UF term code
+        k: number of schedules to return
+        sections: course code -> sections, fetched from the UF API if not given
+        budget: seconds before the best schedules found so far are returned
+
+    Returns:
+        dict with the ranked schedules, courses without usable sections,
+        nodes explored and whether the search ran out of time
+    """
+    if sections is None:
+        sections = prefetch_sections(course_codes, term)
+
+    courses: Dict[str, List[SectionOption]] = {}
+    unavailable = []
+    for code in dict.fromkeys(re.sub(r'\s+', '', code or '').upper() for code in course_codes):
+        # Online sections have no meeting times and can't be placed
+        options = compile_options(code, sections.get(code, []))
+        if options:
+            courses[code] = options
+        else:
+            unavailable.append(code)
+
+    found, nodes, truncated = search(courses, k, budget)
+
+    schedules = []
+    for _, options in found:
+        schedules.append({
+            **score_schedule(options),
+            'sections': [
+                {
+                    **option.sections[0],
+                    # Other sections at the same times, any of them can be swapped in
+                    'alternatives': [section['section'] for section in option.sections[1:]],
+                }
+                for option in sorted(options, key=lambda o: o.course_code)
+            ],
+        })
+
+    return {
+        'schedules': schedules,
+        'unavailable': unavailable,
+        'explored': nodes,
+        'truncated': truncated,
+    }
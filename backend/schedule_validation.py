@@ -0,0 +1,219 @@
+"""
+Conflict checks for a Scheduler slot map.
+
+The Scheduler sends {"Monday-9:35 AM": {course}, ...}. Each slot becomes a
+meeting, resolved against the course's real UF sections (a section that
+meets on that day at that start time supplies the end time, building and
+credits). Slots without a matching section keep the client's end time, or
+one period, and are listed as unmatched.
+
+Overlaps are found with a sweep line per day: meetings sorted by start, a
+min-heap of the ones still running keyed by end time. Every meeting still in
+the heap when the next one starts overlaps it, so all k overlapping pairs
+come out in O(n log n + k).
+
+Validation runs on every drag and drop, so it never waits on the UF API:
+sections come only from the snapshot or the sections cache. Courses that
+aren't loaded yet are fetched in the background and reported as
+unverified, their slots are checked with the client's times until then.
+"""
+import heapq
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from time_model import DAY_INDEX, DEFAULT_MEETING_MINUTES, WEEKDAYS, day_indexes, format_clock, parse_clock, section_fields
+from uf_api_service import cached_sections
+
+# Walking between buildings has to fit in this much time between classes
+PASSING_MINUTES = 15
+MAX_TERM_CREDITS = int(os.getenv('MAX_TERM_CREDITS', 18))
+DEFAULT_CREDITS = 3
+
+
+class Meeting:
+    """One scheduled class meeting on one day"""
+    __slots__ = ('slot', 'code', 'day', 'start', 'end', 'building', 'room', 'section', 'credits')
+
+    def __init__(self, slot: str, code: str, day: int, start: int, end: int, credits=None):
+        self.slot = slot
+        self.code = code
+        self.day = day
+        self.start = start
+        self.end = end
+        self.building = None
+        self.room = None
+        self.section = None
+        self.credits = credits
+
+    def to_dict(self) -> Dict:
+        return {
+            'slot': self.slot,
+            'code': self.code,
+            'day': WEEKDAYS[self.day],
+            'start_time': format_clock(self.start),
+            'end_time': format_clock(self.end),
+            'start_minute': self.start,
+            'end_minute': self.end,
+            'building': self.building,
+            'room': self.room,
+            'section': self.section,
+        }
+
+
+def _credits(value) -> Optional[int]:
+    # The UF API reports variable credit courses as "VAR"
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_slots(schedule_data: Dict) -> Tuple[List[Meeting], List[str]]:
+    """
+    Meetings for every filled slot of a Scheduler slot map.
+
+    Returns:
+        (meetings, keys of slots whose day or time could not be read)
+    """
+    meetings, skipped = [], []
+    for slot, course_data in (schedule_data or {}).items():
+        if not course_data:
+            continue
+        day, _, time = str(slot).partition('-')
+        start = parse_clock(time)
+        code = re.sub(r'\s+', '', str(course_data.get('code') or '')).upper() if isinstance(course_data, dict) else ''
+        if day not in DAY_INDEX or start is None or not code:
+            skipped.append(slot)
+            continue
+        end = parse_clock(course_data.get('end_time'))
+        if end is None or end <= start:
+            end = start + DEFAULT_MEETING_MINUTES
+        meetings.append(Meeting(slot, code, DAY_INDEX[day], start, end, _credits(course_data.get('credits'))))
+    return meetings, skipped
+
+
+def resolve_meetings(meetings: List[Meeting], sections: Dict[str, List[Dict]]) -> List[Meeting]:
+    """
+    Fill in real times, rooms and credits from each course's sections.
+
+    Returns:
+        meetings of courses that have sections but none at the slot's time
+    """
+    # (code, day, start minute) -> section, built once per call
+    index: Dict[Tuple[str, int, int], Dict] = {}
+    for code, course_sections in sections.items():
+        for section in course_sections:
+            times = section_fields(section)
+            if times is None:
+                continue
+            for day in day_indexes(times['day_mask']):
+                index.setdefault((code, day, times['start_minute']), {**section, **times})
+
+    unmatched = []
+    for meeting in meetings:
+        section = index.get((meeting.code, meeting.day, meeting.start))
+        if section is None:
+            if sections.get(meeting.code):
+                unmatched.append(meeting)
+            continue
+        meeting.end = section['end_minute']
+        meeting.building = section.get('building')
+        meeting.room = section.get('room')
+        meeting.section = section.get('section')
+        meeting.credits = _credits(section.get('credits')) or meeting.credits
+    return unmatched
+
+
+def find_overlaps(meetings: List[Meeting]) -> List[Tuple[Meeting, Meeting]]:
+    """Every pair of meetings that overlap in time, earliest first"""
+    overlaps = []
+    for day_meetings in _by_day(meetings):
+        running: List[Tuple[int, int, Meeting]] = []
+        for i, meeting in enumerate(day_meetings):
+            # Meetings that ended by now can't overlap this one or any later one
+            while running and running[0][0] <= meeting.start:
+                heapq.heappop(running)
+            for _, _, other in running:
+                overlaps.append((other, meeting))
+            heapq.heappush(running, (meeting.end, i, meeting))
+    return overlaps
+
+
+def find_building_changes(meetings: List[Meeting], passing: int = PASSING_MINUTES) -> List[Tuple[Meeting, Meeting]]:
+    """Consecutive meetings in different buildings with no more than the passing time between them"""
+    changes = []
+    for day_meetings in _by_day(meetings):
+        for before, after in zip(day_meetings, day_meetings[1:]):
+            if not before.building or not after.building or 'TBD' in (before.building, after.building):
+                continue
+            if before.building != after.building and 0 <= after.start - before.end <= passing:
+                changes.append((before, after))
+    return changes
+
+
+def _by_day(meetings: List[Meeting]) -> List[List[Meeting]]:
+    days: List[List[Meeting]] = [[] for _ in WEEKDAYS]
+    for meeting in meetings:
+        days[meeting.day].append(meeting)
+    for day_meetings in days:
+        day_meetings.sort(key=lambda m: (m.start, m.end))
+    return days
+
+
+def validate_schedule(schedule_data: Dict, term: str = "2251",
+                      sections: Optional[Dict[str, List[Dict]]] = None) -> Dict:
+    """
+    Check a Scheduler slot map against real meeting times.
+
+    Args:
+        schedule_data: slot key ("Monday-9:35 AM") -> course dict with at least a code
+        term: UF term code
+        sections: course code -> sections, read from the snapshot or cache if not given
+
+    Returns:
+        dict with valid (no overlaps), verified (every course checked against
+        real sections), unverified course codes, overlaps, building_changes,
+        unmatched slots, credits and the resolved meetings
+    """
+    meetings, skipped = parse_slots(schedule_data)
+    codes = list(dict.fromkeys(meeting.code for meeting in meetings))
+    if sections is None:
+        loaded = cached_sections(codes, term) if codes else {}
+        sections = {code: course_sections for code, course_sections in loaded.items() if course_sections is not None}
+    # Not loaded yet, or the UF API is failing: only the client's times were checked
+    unverified = [code for code in codes if code not in sections]
+    unmatched = resolve_meetings(meetings, sections)
+
+    overlaps = find_overlaps(meetings)
+    building_changes = find_building_changes(meetings)
+
+    course_credits: Dict[str, int] = {}
+    for meeting in meetings:
+        if meeting.credits is not None or meeting.code not in course_credits:
+            course_credits[meeting.code] = meeting.credits if meeting.credits is not None else DEFAULT_CREDITS
+    total_credits = sum(course_credits.values())
+
+    pair = lambda a, b: {'first': a.to_dict(), 'second': b.to_dict()}
+    return {
+        'valid': not overlaps,
+        'verified': not unverified,
+        'unverified': unverified,
+        'overlaps': [
+            {**pair(a, b), 'minutes': min(a.end, b.end) - max(a.start, b.start)}
+            for a, b in overlaps
+        ],
+        'building_changes': [
+            {**pair(a, b), 'gap_minutes': b.start - a.end}
+            for a, b in building_changes
+        ],
+        'unmatched': [meeting.slot for meeting in unmatched],
+        'skipped': skipped,
+        'credits': {
+            'total': total_credits,
+            'courses': course_credits,
+            'max': MAX_TERM_CREDITS,
+            'over_limit': total_credits > MAX_TERM_CREDITS,
+        },
+        'meetings': [meeting.to_dict() for meeting in meetings],
+    }
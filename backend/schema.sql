@@ -1,3 +1,4 @@
+DROP TABLE IF EXISTS alembic_version;
 DROP TABLE IF EXISTS schedule_courses CASCADE;
 DROP TABLE IF EXISTS user_schedules CASCADE;
 DROP TABLE IF EXISTS user_completed_courses CASCADE;
@@ -51,5 +52,21 @@ CREATE TABLE schedule_courses (
     course_id INT REFERENCES courses(course_id) ON DELETE CASCADE NOT NULL,
     day_of_week VARCHAR(10) NOT NULL,  -- ✅ Made NOT NULL
     start_time VARCHAR(10) NOT NULL,  -- ✅ Changed from TIME to VARCHAR(10)
-    end_time VARCHAR(10)  -- ✅ Changed from TIME to VARCHAR(10)
-);
\ No newline at end of file
+    end_time VARCHAR(10),  -- ✅ Changed from TIME to VARCHAR(10)
+    start_minute INT,  -- minute of week, day * 1440 + minute of day (migrations/versions/0003_integer_slot_times.py)
+    end_minute INT
+);
+
+-- Indexes for the hot lookup columns (migrations/versions/0002_lookup_indexes.py)
+CREATE INDEX ix_users_username ON users (username);
+CREATE INDEX ix_user_completed_courses_course_id ON user_completed_courses (course_id);
+CREATE INDEX ix_user_schedules_user_id_schedule_id ON user_schedules (user_id, schedule_id);
+CREATE INDEX ix_schedule_courses_schedule_id ON schedule_courses (schedule_id);
+CREATE INDEX ix_schedule_courses_course_id ON schedule_courses (course_id);
+
+-- Migration history: this file matches the latest revision in migrations/versions,
+-- so startup doesn't re-run migrations against it. Bump with every new migration.
+CREATE TABLE alembic_version (
+    version_num VARCHAR(32) NOT NULL PRIMARY KEY
+);
+INSERT INTO alembic_version (version_num) VALUES ('0003');
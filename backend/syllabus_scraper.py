@@ -1,130 +1,123 @@
-import requests
 from bs4 import BeautifulSoup
 import re
+import os
+import threading
 import time
 from urllib.parse import urljoin
+from cache_backend import get_cache
+import http_client
+
+# How long the parsed syllabus table is trusted before it is downloaded again
+SYLLABUS_INDEX_TTL = int(os.getenv('SYLLABUS_INDEX_TTL', 6 * 60 * 60))
+
+COURSE_CODE_PATTERN = re.compile(r'[A-Z]{3}\d{4}[A-Z]?')
 
 class CISESyllabusScaper:
     def __init__(self):
         self.syllabus_url = "https://cise.ufl.edu/academics/course-syllabi/"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        # Cache the syllabus page since it doesn't change often
-        self._syllabus_cache = None
+    
+    def index_page(self, soup):
+        """Turn every syllabus table row into a dict of course code -> list of offerings"""
+        offerings = {}
+        
+        for table in soup.find_all('table'):
+            for row in table.find_all('tr'):
+                cells = row.find_all(['td', 'th'])
+                
+                # Need at least Title, Course Number, Section, Instructor
+                if len(cells) < 4:
+                    continue
+                
+                try:
+                    offering = self._parse_row(cells)
+                except Exception as e:
+                    print(f"Error parsing syllabus row: {str(e)}")
+                    continue
+                
+                # A row can list several course numbers (e.g. cross-listed courses)
+                clean_course_number = re.sub(r'\s+', '', cells[1].get_text(strip=True).upper())
+                codes = COURSE_CODE_PATTERN.findall(clean_course_number)
+                for code in dict.fromkeys(codes):
+                    offerings.setdefault(code, []).append(offering)
+                    # Also answer lookups without the lab/combined suffix (COP3502 -> COP3502C)
+                    if not code[-1].isdigit() and code[:-1] not in codes:
+                        offerings.setdefault(code[:-1], []).append(offering)
+        
+        return offerings
+    
+    def _parse_row(self, cells):
+        """
+        Extract one offering based on table structure:
+        Column 0: Title (with link embedded)
+        Column 1: Course Number
+        Column 2: Section(s)
+        Column 3: Instructor
+        Column 4: Semester
+        Column 5: Year
+        """
+        title_cell = cells[0]
+        
+        # Get course title - the text is the clickable link
+        # Look for <a> tag first
+        link_tag = title_cell.find('a')
+        course_title = None
+        syllabus_link = None
+        
+        if link_tag:
+            # Course title is the link text
+            course_title = link_tag.get_text(strip=True)
+            href = link_tag.get('href')
+            
+            if href:
+                # Make absolute URL
+                if href.startswith('http'):
+                    syllabus_link = href
+                else:
+                    syllabus_link = urljoin(self.syllabus_url, href)
+        else:
+            # No link found, just get the text
+            course_title = title_cell.get_text(strip=True)
+        
+        # Clean up the course title (remove "(click to open)" if present)
+        if course_title:
+            course_title = re.sub(r'\s*\(click to open\)\s*', '', course_title, flags=re.IGNORECASE)
+            course_title = course_title.strip()
+        
+        # Get instructor name
+        instructor_name = "TBD"
+        instructor_raw = cells[3].get_text(strip=True)
+        if instructor_raw and instructor_raw.lower() != 'tbd':
+            # Handle "Last, First" format
+            if ',' in instructor_raw:
+                last_name, first_name = instructor_raw.split(',', 1)
+                instructor_name = f"{first_name.strip()} {last_name.strip()}"
+            else:
+                instructor_name = instructor_raw
+        
+        return {
+            'course_title': course_title,
+            'sections': cells[2].get_text(strip=True),
+            'instructor': instructor_name,
+            'semester': cells[4].get_text(strip=True) if len(cells) > 4 else None,
+            'year': cells[5].get_text(strip=True) if len(cells) > 5 else None,
+            'syllabus_url': syllabus_link
+        }
     
     def get_syllabus_info(self, course_code):
         """Get syllabus link and instructor for a course code"""
         try:
-            # Load the syllabus page if not cached
-            if self._syllabus_cache is None:
-                print(f"Loading syllabus page for {course_code}")
-                response = self.session.get(self.syllabus_url, timeout=15)
-                response.raise_for_status()
-                self._syllabus_cache = BeautifulSoup(response.content, 'html.parser')
-                print(f"Syllabus page loaded successfully")
-            
-            soup = self._syllabus_cache
+            offerings = syllabus_index.lookup(course_code)
+            if not offerings:
+                print(f"Course {course_code} not found in any table")
+                return None
             
-            # Find all tables on the page
-            tables = soup.find_all('table')
-            print(f"Found {len(tables)} tables on syllabus page")
-            
-            for table_idx, table in enumerate(tables):
-                rows = table.find_all('tr')
-                print(f"Table {table_idx} has {len(rows)} rows")
-                
-                for row_idx, row in enumerate(rows):
-                    cells = row.find_all(['td', 'th'])
-                    
-                    if len(cells) >= 4:  # Need at least Title, Course Number, Section, Instructor
-                        # Get the course number cell (column 1)
-                        course_number_cell = cells[1] if len(cells) > 1 else None
-                        
-                        if course_number_cell:
-                            course_number_text = course_number_cell.get_text(strip=True)
-                            
-                            # Check if this row contains our course code
-                            # Remove spaces from both for comparison
-                            clean_course_number = re.sub(r'\s+', '', course_number_text.upper())
-                            clean_search_code = re.sub(r'\s+', '', course_code.upper())
-                            
-                            if clean_search_code in clean_course_number or clean_course_number == clean_search_code:
-                                print(f"Found {course_code} in row {row_idx}")
-                                
-                                try:
-                                    # Extract data based on table structure:
-                                    # Column 0: Title (with link embedded)
-                                    # Column 1: Course Number  
-                                    # Column 2: Section(s)
-                                    # Column 3: Instructor
-                                    # Column 4: Semester
-                                    # Column 5: Year
-                                    
-                                    title_cell = cells[0]
-                                    instructor_cell = cells[3] if len(cells) > 3 else None
-                                    
-                                    # Get course title - the text is the clickable link
-                                    # Look for <a> tag first
-                                    link_tag = title_cell.find('a')
-                                    course_title = None
-                                    syllabus_link = None
-                                    
-                                    if link_tag:
-                                        # Course title is the link text
-                                        course_title = link_tag.get_text(strip=True)
-                                        href = link_tag.get('href')
-                                        
-                                        if href:
-                                            # Make absolute URL
-                                            if href.startswith('http'):
-                                                syllabus_link = href
-                                            else:
-                                                syllabus_link = urljoin(self.syllabus_url, href)
-                                            print(f"Found syllabus link: {syllabus_link}")
-                                    else:
-                                        # No link found, just get the text
-                                        course_title = title_cell.get_text(strip=True)
-                                    
-                                    # Clean up the course title (remove "(click to open)" if present)
-                                    if course_title:
-                                        course_title = re.sub(r'\s*\(click to open\)\s*', '', course_title, flags=re.IGNORECASE)
-                                        course_title = course_title.strip()
-                                    
-                                    # Get instructor name
-                                    instructor_name = "TBD"
-                                    if instructor_cell:
-                                        instructor_raw = instructor_cell.get_text(strip=True)
-                                        if instructor_raw and instructor_raw.lower() != 'tbd':
-                                            # Handle "Last, First" format
-                                            if ',' in instructor_raw:
-                                                parts = instructor_raw.split(',', 1)
-                                                if len(parts) == 2:
-                                                    first_name = parts[1].strip()
-                                                    last_name = parts[0].strip()
-                                                    instructor_name = f"{first_name} {last_name}"
-                                                else:
-                                                    instructor_name = instructor_raw
-                                            else:
-                                                instructor_name = instructor_raw
-                                    
-                                    print(f"Extracted - Title: {course_title}, Instructor: {instructor_name}, Link: {syllabus_link}")
-                                    
-                                    return {
-                                        'course_title': course_title,
-                                        'instructor': instructor_name,
-                                        'syllabus_url': syllabus_link
-                                    }
-                                    
-                                except Exception as e:
-                                    print(f"Error parsing row for {course_code}: {str(e)}")
-                                    import traceback
-                                    traceback.print_exc()
-                                    continue
-            
-            print(f"Course {course_code} not found in any table")
-            return None
+            first = offerings[0]
+            return {
+                'course_title': first['course_title'],
+                'instructor': first['instructor'],
+                'syllabus_url': first['syllabus_url'],
+                'offerings': offerings
+            }
             
         except Exception as e:
             print(f"Error getting syllabus info for {course_code}: {str(e)}")
@@ -132,22 +125,86 @@ class CISESyllabusScaper:
             traceback.print_exc()
             return None
 
-# Cache for syllabus data
-syllabus_cache = {}
+class SyllabusIndex:
+    """
+    Course-code index over the CISE syllabus page.
+
+    The page is downloaded and parsed once per TTL window into a dict of
+    normalized course code -> every offering row, so lookups are O(1).
+    """
+    def __init__(self, scraper=None, ttl=SYLLABUS_INDEX_TTL):
+        self.scraper = scraper or CISESyllabusScaper()
+        self.ttl = ttl
+        self._offerings = None
+        self._loaded_at = 0
+        self._validators = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self):
+        return self._offerings is not None and (self.ttl is None or time.time() - self._loaded_at < self.ttl)
+
+    def offerings(self):
+        """Return the full code -> offerings map, loading it if missing or expired"""
+        if self._is_fresh():
+            return self._offerings
+
+        with self._lock:
+            if self._is_fresh():
+                return self._offerings
+            try:
+                print("Loading syllabus page")
+                response, validators = http_client.get_if_changed(
+                    self.scraper.syllabus_url,
+                    self._validators if self._offerings is not None else None,
+                    timeout=15
+                )
+                if response is None:
+                    # Page unchanged since the last parse, just extend its lifetime
+                    print("Syllabus page unchanged")
+                    self._validators = validators
+                    self._loaded_at = time.time()
+                    return self._offerings
+                soup = BeautifulSoup(response.content, 'html.parser')
+                offerings = self.scraper.index_page(soup)
+                print(f"Indexed syllabi for {len(offerings)} course codes")
+            except Exception as e:
+                print(f"Error indexing syllabus page: {str(e)}")
+                # Keep serving the previous copy if we have one
+                return self._offerings or {}
+            self._offerings = offerings
+            self._validators = validators
+            self._loaded_at = time.time()
+            return offerings
+
+    def lookup(self, course_code):
+        """All offerings of a course in page order"""
+        return self.offerings().get(re.sub(r'\s+', '', course_code).upper(), [])
+
+    def refresh(self):
+        """Drop the parsed page so the next lookup downloads it again"""
+        with self._lock:
+            self._offerings = None
+
+syllabus_index = SyllabusIndex()
+
+# Cache for syllabus data, shared across workers (see cache_backend.py).
+# Entries are derived from the index, so they never outlive an index refresh
+SYLLABUS_CACHE_TTL = min(int(os.getenv('SYLLABUS_CACHE_TTL', SYLLABUS_INDEX_TTL)), SYLLABUS_INDEX_TTL)
+syllabus_cache = get_cache('syllabus_info', ttl=SYLLABUS_CACHE_TTL,
+                           max_entries=int(os.getenv('SYLLABUS_CACHE_MAX_ENTRIES', 5000)))
 
 def get_syllabus_info(course_code):
     """Get syllabus information with caching"""
-    if course_code in syllabus_cache:
+    cache_key = re.sub(r'\s+', '', course_code).upper()
+    cached = syllabus_cache.get(cache_key)
+    if cached is not None:
         print(f"Using cached syllabus info for {course_code}")
-        return syllabus_cache[course_code]
+        return cached
     
-    scraper = CISESyllabusScaper()
-    syllabus_info = scraper.get_syllabus_info(course_code)
+    syllabus_info = syllabus_index.scraper.get_syllabus_info(course_code)
     
     if syllabus_info:
-        syllabus_cache[course_code] = syllabus_info
-        # Small delay to be respectful
-        time.sleep(0.3)
+        syllabus_cache.set(cache_key, syllabus_info)
     
     return syllabus_info
 
@@ -0,0 +1,103 @@
+"""
+Canonical time representation for sections and saved schedules.
+
+Times are integers everywhere below the display layer:
+- minute of day (0-1439) for a meeting's start and end
+- minute of week (day index * 1440 + minute of day) for saved schedule slots,
+  so slots sort and compare as plain ints across the whole week
+- day_mask: one bit per weekday, Monday = bit 0
+
+Conflicts are found on these exact minutes (schedule_validation,
+schedule_builder), not on UF periods, so classes that run off the period
+grid are still compared correctly.
+
+Display strings ("9:35 AM") are only produced by format_clock.
+"""
+import re
+from typing import Iterable, Optional, Tuple
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+DAY_INDEX = {day: i for i, day in enumerate(WEEKDAYS)}
+# UF Schedule of Courses meetDays letters
+DAY_CODES = {'M': 0, 'T': 1, 'W': 2, 'R': 3, 'F': 4}
+MINUTES_PER_DAY = 24 * 60
+
+# Sections listed without an end time are assumed to be one 50 minute period
+DEFAULT_MEETING_MINUTES = 50
+
+# "0935", "935", "14:30", "9:35 AM", "9:35am"
+CLOCK_RE = re.compile(r'^\s*(\d{1,2}):?(\d{2})\s*([AaPp][Mm])?\s*$')
+
+
+def parse_clock(value) -> Optional[int]:
+    """Minute of day for a UF API "HHMM" time or a "9:35 AM" display time, None if unparseable"""
+    if isinstance(value, int):
+        return value if 0 <= value < MINUTES_PER_DAY else None
+    match = CLOCK_RE.match(str(value or ''))
+    if not match:
+        return None
+    hour, minute, period = int(match.group(1)), int(match.group(2)), match.group(3)
+    if period:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if period.upper() == 'PM' else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def format_clock(minute_of_day: Optional[int]) -> str:
+    """Display string for a minute of day, e.g. 575 -> "9:35 AM" """
+    if minute_of_day is None:
+        return ""
+    hour, minute = divmod(minute_of_day % MINUTES_PER_DAY, 60)
+    period = "AM" if hour < 12 else "PM"
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {period}"
+
+
+def day_mask(days: Iterable[str]) -> int:
+    """Bit per weekday from day names ("Monday") or UF day letters ("M")"""
+    mask = 0
+    for day in days:
+        idx = DAY_INDEX.get(day, DAY_CODES.get(day))
+        if idx is not None:
+            mask |= 1 << idx
+    return mask
+
+
+def day_indexes(mask: int) -> Tuple[int, ...]:
+    return tuple(i for i in range(len(WEEKDAYS)) if mask >> i & 1)
+
+
+
+def minute_of_week(day: int, minute_of_day: int) -> int:
+    return day * MINUTES_PER_DAY + minute_of_day
+
+
+def meeting_fields(days: Iterable[str], begin, end=None) -> Optional[dict]:
+    """
+    Integer time fields for one meeting pattern.
+
+    Returns:
+        dict with day_mask, start_minute and end_minute, or None if
+        there is no weekday or start time
+    """
+    days_bits = day_mask(days)
+    start = parse_clock(begin)
+    if not days_bits or start is None:
+        return None
+    finish = parse_clock(end)
+    if finish is None or finish <= start:
+        finish = start + DEFAULT_MEETING_MINUTES
+    return {
+        'day_mask': days_bits,
+        'start_minute': start,
+        'end_minute': finish,
+    }
+
+
+def section_fields(section: dict) -> Optional[dict]:
+    """Integer time fields of a section, parsed from its display strings if it predates them"""
+    if section.get('start_minute') is not None and section.get('day_mask'):
+        return section
+    return meeting_fields(section.get('days', []), section.get('start_time'), section.get('end_time'))
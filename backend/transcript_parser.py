@@ -0,0 +1,124 @@
+"""
+Server-side transcript PDF parser.
+
+The upload is spooled to a temporary file and parsed in a separate worker
+process, one page at a time: PyPDF2 only loads the objects of the page being
+read, and each page's text is scanned and dropped before the next one, so
+the whole document is never held in memory as text.
+
+Course codes and grades are matched with precompiled patterns. A course
+counts as completed unless every attempt at it has a failing or withdrawn
+grade (E, U, W, WF, NG); courses without a grade (in progress, transfer)
+count, as they did with the old browser-side parser.
+
+Parsing is CPU bound pure Python, so it runs on a ProcessPoolExecutor of
+TRANSCRIPT_PARSE_WORKERS processes. At most TRANSCRIPT_PARSE_MAX_PENDING
+uploads are queued or parsing at once; past that TranscriptParserBusy is
+raised instead of piling up work. Workers are started by a forkserver, so
+they don't inherit the web process's threads, locks or database connections.
+"""
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Tuple
+
+from PyPDF2 import PdfReader
+
+from bounded_pool import BoundedPool
+
+TRANSCRIPT_PARSE_WORKERS = int(os.getenv('TRANSCRIPT_PARSE_WORKERS', 2))
+TRANSCRIPT_PARSE_MAX_PENDING = int(os.getenv('TRANSCRIPT_PARSE_MAX_PENDING', 8))
+TRANSCRIPT_PARSE_TIMEOUT = float(os.getenv('TRANSCRIPT_PARSE_TIMEOUT', 30))
+TRANSCRIPT_MAX_PAGES = int(os.getenv('TRANSCRIPT_MAX_PAGES', 50))
+TRANSCRIPT_MAX_BYTES = int(os.getenv('TRANSCRIPT_MAX_BYTES', 10 * 1024 * 1024))
+
+# Same codes the browser parser matched, e.g. "COP 3502C" or "MAC2311"
+COURSE_RE = re.compile(r'\b([A-Z]{3})\s?(\d{4}[A-Z]?)\b')
+# A grade token followed by a credit/points column or the end of the course's text.
+# "I" (incomplete) is left out on purpose, it is indistinguishable from "CALCULUS I"
+GRADE_RE = re.compile(r'(?<![\w+-])(A-?|[BCD][+-]?|E|S|U|WF?|NG)(?![\w+-])(?=\s+\d+\.\d+|\s*$)')
+NOT_PASSED = frozenset({'E', 'U', 'W', 'WF', 'NG'})
+
+
+class TranscriptParseError(ValueError):
+    """The upload is not a readable PDF transcript"""
+
+
+class TranscriptParserBusy(RuntimeError):
+    """Too many transcripts are already queued for parsing"""
+
+
+def iter_page_courses(text: str) -> Iterator[Tuple[str, str]]:
+    """(course code, grade or '') for every course code in one page of text"""
+    matches = list(COURSE_RE.finditer(text))
+    for i, match in enumerate(matches):
+        # The course's row runs until the next course code on the page
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        line_end = text.find('\n', match.end(), end)
+        segment = text[match.end():end if line_end == -1 else line_end]
+        grades = GRADE_RE.findall(segment)
+        yield match.group(1) + match.group(2), grades[-1] if grades else ''
+
+
+def parse_transcript(path: str) -> Dict:
+    """
+    Parse a transcript PDF page by page.
+
+    Returns:
+        dict with courses (completed codes in transcript order), not_passed,
+        grades (code -> last grade seen) and pages
+    """
+    grades: Dict[str, str] = {}
+    passed: Dict[str, None] = {}
+    failed: Dict[str, None] = {}
+    try:
+        with open(path, 'rb') as f:
+            reader = PdfReader(f)
+            pages = len(reader.pages)
+            if pages > TRANSCRIPT_MAX_PAGES:
+                raise TranscriptParseError(f"Transcript has {pages} pages, at most {TRANSCRIPT_MAX_PAGES} are read")
+            for page in reader.pages:
+                for code, grade in iter_page_courses(page.extract_text() or ''):
+                    if grade:
+                        grades[code] = grade
+                    if grade in NOT_PASSED:
+                        failed.setdefault(code)
+                    else:
+                        passed.setdefault(code)
+    except TranscriptParseError:
+        raise
+    except Exception as e:
+        # PyPDF2 raises a range of exception types on damaged files
+        raise TranscriptParseError(f"Could not read PDF: {str(e)}")
+
+    return {
+        'courses': list(passed),
+        'not_passed': [code for code in failed if code not in passed],
+        'grades': grades,
+        'pages': pages,
+    }
+
+
+_pool = BoundedPool(
+    lambda: ProcessPoolExecutor(
+        max_workers=TRANSCRIPT_PARSE_WORKERS,
+        mp_context=multiprocessing.get_context('forkserver'),
+    ),
+    max_pending=TRANSCRIPT_PARSE_MAX_PENDING,
+    timeout=TRANSCRIPT_PARSE_TIMEOUT,
+    busy=TranscriptParserBusy,
+    busy_message="Too many transcripts are being parsed, try again shortly",
+)
+
+
+def parse_transcript_in_pool(path: str) -> Dict:
+    """
+    Parse a transcript on the worker pool and wait for the result.
+
+    Raises:
+        TranscriptParserBusy: TRANSCRIPT_PARSE_MAX_PENDING uploads are already in flight
+        TranscriptParseError: the file is not a readable transcript
+        concurrent.futures.TimeoutError: parsing took longer than TRANSCRIPT_PARSE_TIMEOUT
+    """
+    return _pool.run(parse_transcript, path)
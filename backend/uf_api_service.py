@@ -6,16 +6,55 @@ This service integrates with:
 2. UF Course Catalog for descriptions
 3. CISE syllabus repository
 """
-import requests
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
+import http_client
+from cache_backend import get_cache
+from time_model import DAY_CODES, WEEKDAYS, format_clock, meeting_fields, parse_clock
 
 UF_API_BASE = "https://one.ufl.edu/apix/soc/schedule"
 
+COURSE_CODE_RE = re.compile(r'^([A-Z]{3})(\d{4}[A-Z]?)$')
+
+# Parsed sections per (term, course), shared across workers (see cache_backend.py)
+SECTIONS_CACHE_TTL = int(os.getenv('SECTIONS_CACHE_TTL', 60 * 60))
+# A failed fetch is remembered this long, so an outage costs one attempt per course
+SECTIONS_FAILURE_TTL = int(os.getenv('SECTIONS_FAILURE_TTL', 60))
+SECTIONS_TIMEOUT = float(os.getenv('SECTIONS_TIMEOUT', 15))
+MAX_SECTION_PAGES = 10
+sections_cache = get_cache('uf_sections', ttl=SECTIONS_CACHE_TTL, max_entries=5000)
+
+# Stored in place of a section list while a course's last fetch failed
+FETCH_FAILED = {'fetch_failed': True}
+
+# Striped locks so concurrent misses for one course start a single request
+_course_locks = [threading.Lock() for _ in range(64)]
+
+# Bounded pool for concurrent course prefetches
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('SECTIONS_PREFETCH_WORKERS', 4)),
+    thread_name_prefix='sections-prefetch'
+)
+
+# Offline snapshot installed at startup (see course_snapshot.py)
+_snapshot = None
+
+def use_snapshot(snapshot) -> None:
+    """Serve sections for the snapshot's term without calling the UF API"""
+    global _snapshot
+    _snapshot = snapshot
+
 def get_course_sections(course_code: str, term: str = "2251") -> List[Dict]:
     """
     Fetch course sections from UF API for a given course code.
     
+    Results are cached for SECTIONS_CACHE_TTL seconds, failures for
+    SECTIONS_FAILURE_TTL, and concurrent callers for the same course share
+    one request.
+    
     Args:
         course_code: Course code like "COP3502C" or "COP 3502C"
         term: Term code (default: 2251 for Spring 2025)
@@ -25,45 +64,153 @@ def get_course_sections(course_code: str, term: str = "2251") -> List[Dict]:
         List of section dictionaries with meeting times
     """
     # Normalize course code (remove spaces, uppercase)
-    normalized_code = re.sub(r'\s+', '', course_code).upper()
+    normalized_code = re.sub(r'\s+', '', course_code or '').upper()
+    if not COURSE_CODE_RE.match(normalized_code):
+        return []
     
-    # Extract department and number (e.g., COP3502C -> COP and 3502C)
-    match = re.match(r'^([A-Z]{3})(\d{4}[A-Z]?)$', normalized_code)
-    if not match:
+    if _snapshot is not None and _snapshot.term == term:
+        return [dict(section) for section in _snapshot.sections.get(normalized_code, [])]
+    
+    cache_key = f"{term}:{normalized_code}"
+    cached = sections_cache.get(cache_key)
+    if cached is None:
+        with _course_locks[hash(cache_key) % len(_course_locks)]:
+            cached = sections_cache.get(cache_key)
+            if cached is None:
+                try:
+                    cached = _fetch_course_sections(normalized_code, term)
+                    sections_cache.set(cache_key, cached)
+                except Exception as e:
+                    print(f"Error fetching sections for {normalized_code} ({term}): {str(e)}")
+                    cached = FETCH_FAILED
+                    sections_cache.set(cache_key, cached, ttl=SECTIONS_FAILURE_TTL)
+    
+    if cached == FETCH_FAILED:
         return []
+    return [dict(section) for section in cached]
+
+
+def prefetch_sections(course_codes: List[str], term: str = "2251") -> Dict[str, List[Dict]]:
+    """
+    Load sections for a whole schedule, fetching the courses concurrently.
     
-    dept_code = match.group(1)
-    course_num = match.group(2)
+    Returns a dict of normalized course code -> sections.
+    """
+    codes = _normalize_codes(course_codes)
+    if _snapshot is not None and _snapshot.term == term:
+        return {code: get_course_sections(code, term) for code in codes}
+    return dict(zip(codes, _prefetch_executor.map(lambda code: get_course_sections(code, term), codes)))
+
+
+def cached_sections(course_codes: List[str], term: str = "2251") -> Dict[str, Optional[List[Dict]]]:
+    """
+    Sections already in the snapshot or cache, without calling the UF API.
     
-    try:
-        # Query UF API
-        params = {
-            'category': 'CWSP',  # Course Work Service Provider
-            'term': term,
-            'dept': dept_code,
-            'course-code': course_num
+    Returns a dict of normalized course code -> sections, or None for courses
+    that aren't loaded (or whose last fetch failed). Those are fetched in the
+    background so a later call can answer them.
+    """
+    codes = _normalize_codes(course_codes)
+    if _snapshot is not None and _snapshot.term == term:
+        # The snapshot only lists courses that have sections, absence proves nothing
+        return {
+            code: [dict(section) for section in _snapshot.sections[code]] if code in _snapshot.sections else None
+            for code in codes
         }
-        
-        response = requests.get(UF_API_BASE, params=params, timeout=10)
+    
+    result: Dict[str, Optional[List[Dict]]] = {}
+    for code in codes:
+        cached = sections_cache.get(f"{term}:{code}")
+        if cached is None:
+            _warm_in_background(code, term)
+        result[code] = None if cached is None or cached == FETCH_FAILED else cached
+    return result
+
+
+_warming = set()
+_warming_lock = threading.Lock()
+
+def _warm_in_background(course_code: str, term: str) -> None:
+    """Fetch a course's sections on the prefetch pool unless a fetch is already queued"""
+    key = (term, course_code)
+    with _warming_lock:
+        if key in _warming:
+            return
+        _warming.add(key)
+    
+    def warm():
+        try:
+            with http_client.background_requests():
+                get_course_sections(course_code, term)
+        finally:
+            with _warming_lock:
+                _warming.discard(key)
+    
+    _prefetch_executor.submit(warm)
+
+
+def _normalize_codes(course_codes: List[str]) -> List[str]:
+    codes = []
+    for code in course_codes:
+        normalized_code = re.sub(r'\s+', '', code or '').upper()
+        if COURSE_CODE_RE.match(normalized_code) and normalized_code not in codes:
+            codes.append(normalized_code)
+    return codes
+
+
+def _fetch_course_sections(course_code: str, term: str) -> List[Dict]:
+    """
+    Query the UF API for one course, following its paging cursor.
+    
+    One request per course, not per department: the API's dept parameter
+    isn't documented to filter by course prefix, so a department listing
+    can't be relied on to contain every course asked for.
+    """
+    match = COURSE_CODE_RE.match(course_code)
+    sections: List[Dict] = []
+    params = {
+        'category': 'CWSP',  # Course Work Service Provider
+        'term': term,
+        'dept': match.group(1),
+        'course-code': match.group(2)
+    }
+    
+    for _ in range(MAX_SECTION_PAGES):
+        response = http_client.get(UF_API_BASE, params=params, timeout=SECTIONS_TIMEOUT)
         response.raise_for_status()
-        
         data = response.json()
         
         # Extract sections with meeting times
-        sections = []
-        if isinstance(data, list):
-            for course_data in data:
-                if 'sections' in course_data:
-                    for section in course_data['sections']:
-                        section_info = parse_section(section, course_code)
-                        if section_info:
-                            sections.append(section_info)
+        for course_data in _iter_courses(data):
+            listed_code = re.sub(r'\s+', '', course_data.get('code', '')).upper()
+            # course-code matches by number, keep only the course that was asked for
+            if listed_code and listed_code != course_code:
+                continue
+            for section in course_data.get('sections', []):
+                section_info = parse_section(section, course_code)
+                if section_info:
+                    sections.append(section_info)
         
-        return sections
+        page = data[0] if isinstance(data, list) and data and isinstance(data[0], dict) else {}
+        last_control = page.get('LASTCONTROLNUMBER')
+        if not page.get('RETRIEVEDROWS') or not last_control or last_control >= page.get('TOTALROWS', 0):
+            break
+        params['last-control-number'] = last_control
     
-    except Exception as e:
-        print(f"Error fetching course {course_code}: {str(e)}")
-        return []
+    return sections
+
+
+def _iter_courses(data):
+    """Yield course entries from either response shape of the UF API"""
+    if not isinstance(data, list):
+        return
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        if 'COURSES' in item:
+            yield from item['COURSES']
+        elif 'sections' in item:
+            yield item
 
 
 def parse_section(section: Dict, course_code: str) -> Optional[Dict]:
@@ -79,16 +226,8 @@ def parse_section(section: Dict, course_code: str) -> Optional[Dict]:
     meet_times = section['meetTimes'][0]  # Use first meeting time pattern
     
     # Parse meeting days
-    days_map = {
-        'M': 'Monday',
-        'T': 'Tuesday',
-        'W': 'Wednesday',
-        'R': 'Thursday',
-        'F': 'Friday'
-    }
-    
     meet_days_str = meet_times.get('meetDays', '')
-    days = [days_map[d] for d in meet_days_str if d in days_map]
+    days = [WEEKDAYS[DAY_CODES[d]] for d in meet_days_str if d in DAY_CODES]
     
     if not days:
         return None
@@ -97,20 +236,19 @@ def parse_section(section: Dict, course_code: str) -> Optional[Dict]:
     time_begin = meet_times.get('meetTimeBegin')
     time_end = meet_times.get('meetTimeEnd')
     
-    if not time_begin:
+    # Integer times (see time_model.py), display strings are derived from them
+    times = meeting_fields(days, time_begin, time_end)
+    if times is None:
         return None
     
-    # Format time (e.g., "0935" -> "9:35 AM")
-    start_time = format_time(time_begin)
-    end_time = format_time(time_end) if time_end else None
-    
     return {
         'course_code': course_code,
         'section': section.get('classNumber', ''),
         'instructor': ', '.join(section.get('instructors', [])) or 'TBD',
         'days': days,
-        'start_time': start_time,
-        'end_time': end_time,
+        'start_time': format_clock(times['start_minute']),
+        'end_time': format_clock(times['end_minute']) if time_end else None,
+        **times,
         'building': meet_times.get('meetBuilding', 'TBD'),
         'room': meet_times.get('meetRoom', ''),
         'credits': section.get('credits', 3)
@@ -125,16 +263,7 @@ def format_time(time_str: str) -> str:
     if not time_str or len(time_str) < 4:
         return ""
     
-    hour = int(time_str[:2])
-    minute = time_str[2:4]
-    
-    period = "AM" if hour < 12 else "PM"
-    if hour > 12:
-        hour -= 12
-    elif hour == 0:
-        hour = 12
-    
-    return f"{hour}:{minute} {period}"
+    return format_clock(parse_clock(time_str))
 
 
 def get_course_description(course_code: str) -> str:
@@ -149,7 +278,7 @@ def get_course_description(course_code: str) -> str:
     """
     # Normalize course code
     normalized = re.sub(r'\s+', '', course_code).upper()
-    match = re.match(r'^([A-Z]{3})(\d{4}[A-Z]?)$', normalized)
+    match = COURSE_CODE_RE.match(normalized)
     
     if not match:
         return ""
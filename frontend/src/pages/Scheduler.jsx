@@ -26,6 +26,7 @@ export default function Scheduler() {
   const [showModal, setShowModal] = useState(false);
   const [scheduleName, setScheduleName] = useState("");
   const [modalPosition, setModalPosition] = useState({ top: 0, left: 0 });
+  const [validation, setValidation] = useState(null);
 
   const days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"];
   const times = ["8:30 AM", "9:35 AM", "10:40 AM", "11:45 AM", "12:50 PM", 
@@ -78,6 +79,83 @@ export default function Scheduler() {
     }
   };
 
+  // Fetch course information for many courses in one request
+  const fetchCourseInfoBatch = async (courseCodes) => {
+    const codes = [...new Set(courseCodes)].filter(
+      code => !courseInfo[code] && !loadingCourseInfo.has(code)
+    );
+    if (codes.length === 0) {
+      return;
+    }
+
+    setLoadingCourseInfo(prev => {
+      const newSet = new Set(prev);
+      codes.forEach(code => newSet.add(code));
+      return newSet;
+    });
+
+    try {
+      const response = await fetch('http://127.0.0.1:5000/get-course-info/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ codes })
+      });
+      const data = await response.json();
+
+      if (data.success) {
+        setCourseInfo(prev => ({
+          ...prev,
+          ...data.course_info
+        }));
+      }
+    } catch (error) {
+      console.error('Error fetching course info batch:', error);
+    } finally {
+      setLoadingCourseInfo(prev => {
+        const newSet = new Set(prev);
+        codes.forEach(code => newSet.delete(code));
+        return newSet;
+      });
+    }
+  };
+
+  // Re-check overlaps and building changes whenever a course is placed or removed
+  useEffect(() => {
+    if (Object.keys(schedule).length === 0) {
+      setValidation(null);
+      return;
+    }
+    const controller = new AbortController();
+    let retry = null;
+    const validate = (attempt) => {
+      fetch('http://127.0.0.1:5000/validate-schedule', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ schedule }),
+        signal: controller.signal
+      })
+        .then(response => response.ok ? response.json() : null)
+        .then(data => {
+          setValidation(data);
+          // Sections still loading on the server, check once more when they should be in
+          if (data && !data.verified && attempt === 0) {
+            retry = setTimeout(() => validate(1), 3000);
+          }
+        })
+        .catch(error => {
+          if (error.name !== 'AbortError') {
+            console.error('Error validating schedule:', error);
+          }
+        });
+    };
+    validate(0);
+    // A newer drop supersedes the request still in flight
+    return () => {
+      controller.abort();
+      clearTimeout(retry);
+    };
+  }, [schedule]);
+
   // Modified useEffect to include course info fetching
   useEffect(() => {
     const loadSavedSchedules = async () => {
@@ -122,25 +200,8 @@ export default function Scheduler() {
         // const classes = localStorage.getItem('parsed_classes') || '';
         console.log('Fetching recommendations for user:', user_id);
 
-        console.log('Fetching completed courses from database for user:', user_id);
-      
-        // Step 1: Get completed courses from database
-        const completedResponse = await fetch(`http://127.0.0.1:5000/get-user-completed-courses/${user_id}`);
-        
-        if (!completedResponse.ok) {
-          throw new Error('Failed to fetch completed courses');
-        }
-        
-        const completedData = await completedResponse.json();
-        console.log('Completed courses from DB:', completedData);
-        
-        const completedCourses = completedData.completed_courses || [];
-        
-        // Step 2: Get recommendations based on completed courses
-        const classesParam = completedCourses.join(',');
-        console.log('Fetching recommendations with classes:', classesParam);
-
-        const response = await fetch(`http://127.0.0.1:5000/get-course-recommendations?user_id=${user_id}&classes=${classesParam}`);
+        // The backend reads the saved transcript itself, no need to send it back
+        const response = await fetch(`http://127.0.0.1:5000/get-course-recommendations?user_id=${user_id}`);
         const data = await response.json();
         console.log('Received data:', data);
         
@@ -153,7 +214,6 @@ export default function Scheduler() {
           const formattedCourses = {
             "Core Classes": (data.recommendations.Core || []).map(code => {
               const timeInfo = generateRandomTime();
-              fetchCourseInfo(code);
               return {
                 code,
                 name: `Course ${code}`,
@@ -166,7 +226,6 @@ export default function Scheduler() {
             }),
             "Technical Electives": (data.recommendations["Elective/eligible"] || []).map(code => {
               const timeInfo = generateRandomTime();
-              fetchCourseInfo(code);
               return {
                 code,
                 name: `Course ${code}`,
@@ -179,7 +238,6 @@ export default function Scheduler() {
             }),
             "General Education": (data.recommendations.GenEd || []).map(code => {
               const timeInfo = generateRandomTime();
-              fetchCourseInfo(code);
               return {
                 code,
                 name: `Course ${code}`,
@@ -194,6 +252,11 @@ export default function Scheduler() {
 
           console.log('Formatted courses:', formattedCourses);
           setCourseCategories(formattedCourses);
+
+          // Load info for every recommended course in one round trip
+          fetchCourseInfoBatch(
+            Object.values(formattedCourses).flat().map(course => course.code)
+          );
         } else {
           console.error('Failed to fetch recommendations:', data.error);
         }
@@ -675,6 +738,33 @@ export default function Scheduler() {
             </div>
           </div>
 
+          {validation && !validation.verified && (
+            <Alert variant="info" className="mb-4">
+              Class times for {validation.unverified.join(', ')} couldn't be checked against the UF schedule yet.
+            </Alert>
+          )}
+          {validation && validation.overlaps.length > 0 && (
+            <Alert variant="error" className="mb-4">
+              {validation.overlaps.map((overlap, i) => (
+                <div key={i}>
+                  {overlap.first.code} and {overlap.second.code} overlap on {overlap.first.day} ({overlap.minutes} min)
+                </div>
+              ))}
+            </Alert>
+          )}
+          {validation && (validation.building_changes.length > 0 || validation.credits.over_limit) && (
+            <Alert variant="warning" className="mb-4">
+              {validation.building_changes.map((change, i) => (
+                <div key={i}>
+                  {change.gap_minutes} min to get from {change.first.building} ({change.first.code}) to {change.second.building} ({change.second.code}) on {change.first.day}
+                </div>
+              ))}
+              {validation.credits.over_limit && (
+                <div>{validation.credits.total} credits is over the {validation.credits.max} credit limit</div>
+              )}
+            </Alert>
+          )}
+
           <div className="schedule-grid">
             {/* Top-left corner */}
             <div className="time-header">Time</div>
@@ -1,12 +1,8 @@
 import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
-import * as pdfjsLib from "pdfjs-dist";
-import pdfjsWorker from "pdfjs-dist/build/pdf.worker.min.mjs?url";
 import { Button, Card, CardBody, Input, Select, Container, Section, Alert, LoadingSpinner } from "../components/UIComponents";
 import "./Transcript.css";
 
-pdfjsLib.GlobalWorkerOptions.workerSrc = pdfjsWorker;
-
 export default function Transcript() {
   const navigate = useNavigate();
   const [file, setFile] = useState(null);
@@ -55,26 +51,32 @@ export default function Transcript() {
     return Object.keys(newErrors).length === 0;
   };
 
-  const handleParse = async () => {
+  // The backend parses the PDF and, given a user_id, saves the courses in the same request
+  const handleParse = async (user_id) => {
     if (!validateForm()) return null;
 
     setIsLoading(true);
     
     try {
-      const arrayBuffer = await file.arrayBuffer();
-      const pdf = await pdfjsLib.getDocument({ data: arrayBuffer }).promise;
+      const body = new FormData();
+      body.append("file", file);
+      if (user_id) {
+        body.append("user_id", user_id);
+      }
+
+      const response = await fetch("http://127.0.0.1:5000/api/upload", {
+        method: "POST",
+        body,
+      });
+      const data = await response.json();
 
-      let fullText = "";
-      for (let i = 1; i <= pdf.numPages; i++) {
-        const page = await pdf.getPage(i);
-        const content = await page.getTextContent();
-        const text = content.items.map((item) => item.str).join(" ");
-        fullText += text + "\n";
+      if (!response.ok) {
+        console.error('ERROR - Failed to parse transcript:', data);
+        setErrors({ general: data.error || "Error parsing PDF. Please try again." });
+        return null;
       }
 
-      const courseRegex = /\b[A-Z]{3}\s?\d{4}[A-Z]?\b/g;
-      const matches = fullText.match(courseRegex) || [];
-      const unique = [...new Set(matches)];
+      const unique = data.classes || [];
       setClasses(unique);
       return unique;
     } catch (error) {
@@ -86,23 +88,14 @@ export default function Transcript() {
   };
 
   const handleParseAndSave = async () => {
-    const parsed = await handleParse();
-    if (parsed === null) return;
-    
-    if (parsed.length === 0) {
-      setErrors({ general: 'No courses found in transcript' });
-      return;
-    }
-    
+    if (!validateForm()) return;
+
     const user_id = localStorage.getItem("user_id");
     if (!user_id) {
       setErrors({ general: 'No user_id found — please sign in or sign up first' });
       return;
     }
 
-    // Normalize parsed codes client-side
-    const normalized = parsed.map((s) => (s || '').toString().replace(/\s+/g, '').toUpperCase()).filter(Boolean);
-    
     try {
       const res = await fetch("http://127.0.0.1:5000/update-user-info", {
         method: "POST",
@@ -113,36 +106,21 @@ export default function Transcript() {
       if (!res.ok) {
         setErrors({ general: 'Failed to save user information' });
       }
-
-      const saveResponse = await fetch('http://127.0.0.1:5000/save-transcript', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          user_id: parseInt(user_id),
-          classes: parsed  
-        })
-      });
-
-      const saveData = await saveResponse.json();
-      
-      if (!saveResponse.ok) {
-        console.error('ERROR - Failed to save transcript:', saveData);
-        setErrors({ general: `Failed to save courses: ${saveData.error}` });
-        // Still navigate but show error
-        localStorage.setItem('parsed_classes', parsed.join(','));
-        navigate('/scheduler');
-      } else {
-        localStorage.setItem('parsed_classes', parsed.join(','));
-        navigate('/scheduler');
-      }
-
     } catch (error) {
       setErrors({ general: 'Network error. Please try again.' });
-      localStorage.setItem('parsed_classes', parsed.join(','));
-      alert('Network error. Courses saved locally only.');
+      return;
     }
+
+    const parsed = await handleParse(user_id);
+    if (parsed === null) return;
+    
+    if (parsed.length === 0) {
+      setErrors({ general: 'No courses found in transcript' });
+      return;
+    }
+
+    localStorage.setItem('parsed_classes', parsed.join(','));
+    navigate('/scheduler');
   };
 
   const gradeOptions = [